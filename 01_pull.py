@@ -5,20 +5,66 @@
 # -----------------------------------------------
 
 # To run: type python 01_pull.py in terminal
+# Async mode (concurrent, rate limited): python 01_pull.py --async --concurrency 8 --rate 4
+# Benchmark against a local stand-in server: python 01_pull.py --bench
+# Re-runs are incremental: catalog_manifest.json remembers each page's ETag/Last-Modified/hash,
+# so unchanged pages come back as 304 Not Modified and are not rewritten
 
 import requests
 from bs4 import BeautifulSoup
+import http_client
+import argparse
+import asyncio
+import contextlib
+import datetime
+import functools
+import hashlib
+import http.server
+import json
 import os
+import random
+import tempfile
+import threading
 import time
+from urllib.parse import urlsplit
 
 BASE_URL = "https://catalog.northeastern.edu/course-descriptions/"
 HEADERS = {"User-Agent": "Mozilla/5.0 (compatible; CatalogScraper/1.0)"}
 SAVE_DIR = "catalog_html"
+MANIFEST_FILE = "catalog_manifest.json"
+
+# Files this script reads and writes (used by 09_pipeline.py to schedule it)
+INPUTS = []
+OUTPUTS = [SAVE_DIR, MANIFEST_FILE]
+
+# Async mode settings: how many pages can be in flight at once, how many requests
+# per second each host gets (token bucket), and how hard to retry failed pages
+CONCURRENCY = 8
+RATE_PER_HOST = 4.0
+BURST = 4
+MAX_RETRIES = 3
+BACKOFF_BASE = 0.5
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+TIMEOUT = 30
 
 os.makedirs(SAVE_DIR, exist_ok=True)
 
+# Pooled keep-alive client shared by every fetch; retries are left to async mode's own jittered loop.
+# Its per-host cap (and so its pool) has to fit the requests in flight, so main() and benchmark() rebuild it
+# for --concurrency
+def make_client(concurrency=CONCURRENCY):
+	return http_client.CatalogClient(headers=HEADERS, retries=0, per_host=concurrency, timeout=TIMEOUT)
+
+CLIENT = make_client()
+
+def use_concurrency(concurrency):
+	global CLIENT
+	if CLIENT.per_host != concurrency:
+		CLIENT.close()
+		CLIENT = make_client(concurrency)
+
 def fetch_main_page():
-	resp = requests.get(BASE_URL, headers=HEADERS)
+	resp = CLIENT.get(BASE_URL)
 	resp.raise_for_status()
 	return resp.text
 
@@ -34,22 +80,209 @@ def parse_subcategory_links(html):
 				links.append(full_url)
 	return links
 
-def fetch_and_save_subcategory(url, idx):
-	resp = requests.get(url, headers=HEADERS)
-	resp.raise_for_status()
-	fname = os.path.join(SAVE_DIR, f"subcategory_{idx:03d}.html")
+def page_path(idx, save_dir=SAVE_DIR):
+	return os.path.join(save_dir, f"subcategory_{idx:03d}.html")
+
+# Pages are always named after their position in the link list, so both modes write the same files
+def save_page(text, idx, save_dir=SAVE_DIR):
+	fname = page_path(idx, save_dir)
 	with open(fname, "w", encoding="utf-8") as f:
-		f.write(resp.text)
-	print(f"Saved {url} -> {fname}")
-	time.sleep(1)  # be polite
+		f.write(text)
+	return fname
+
+# The crawl manifest maps each URL to the file it was saved as plus the validators needed for a conditional re-fetch
+def load_manifest(path=MANIFEST_FILE):
+	if not os.path.exists(path):
+		return {"pages": {}}
+	with open(path, "r", encoding="utf-8") as f:
+		return json.load(f)
+
+def save_manifest(manifest, path=MANIFEST_FILE):
+	with open(path, "w", encoding="utf-8") as f:
+		json.dump(manifest, f, ensure_ascii=False, indent=2)
 
-def main():
+# Only ask for a 304 if we still have the page on disk to fall back on
+def conditional_headers(manifest, url, fname):
+	headers = {}
+	entry = manifest["pages"].get(url) if manifest else None
+	if entry and entry.get("file") == fname and os.path.exists(fname):
+		if entry.get("etag"):
+			headers["If-None-Match"] = entry["etag"]
+		if entry.get("last_modified"):
+			headers["If-Modified-Since"] = entry["last_modified"]
+	return headers
+
+# Writes the page only if it actually changed, updates the manifest entry and returns 'new', 'changed' or 'unchanged'
+def record_page(manifest, url, idx, resp, save_dir=SAVE_DIR):
+	fname = page_path(idx, save_dir)
+	entry = manifest["pages"].get(url) if manifest else None
+	if resp.status_code == 304:
+		status = "unchanged"
+	else:
+		digest = hashlib.sha256(resp.content).hexdigest()
+		if entry and entry.get("file") == fname and entry.get("sha256") == digest and os.path.exists(fname):
+			status = "unchanged"
+		else:
+			status = "changed" if entry else "new"
+			save_page(resp.text, idx, save_dir)
+		entry = dict(entry or {}, sha256=digest)
+	if manifest is not None:
+		entry.update({
+			"file": fname,
+			"etag": resp.headers.get("ETag", entry.get("etag")),
+			"last_modified": resp.headers.get("Last-Modified", entry.get("last_modified")),
+			"fetched_at": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+		})
+		manifest["pages"][url] = entry
+	return status
+
+def fetch_and_save_subcategory(url, idx, save_dir=SAVE_DIR, delay=1, manifest=None):
+	resp = CLIENT.get(url, headers=conditional_headers(manifest, url, page_path(idx, save_dir)))
+	resp.raise_for_status()
+	status = record_page(manifest, url, idx, resp, save_dir)
+	print(f"{status.capitalize()}: {url} -> {page_path(idx, save_dir)}")
+	time.sleep(delay)  # be polite
+	return status
+
+class TokenBucket:
+	"""
+	Token bucket rate limiter: refills `rate` tokens per second up to `capacity`.
+	Each request takes one token, so bursts are allowed but the long-run rate is capped.
+	"""
+	def __init__(self, rate, capacity):
+		self.rate = rate
+		self.capacity = capacity
+		self.tokens = capacity
+		self.updated = time.monotonic()
+		self.lock = asyncio.Lock()
+
+	async def acquire(self):
+		async with self.lock:
+			while True:
+				now = time.monotonic()
+				self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+				self.updated = now
+				if self.tokens >= 1:
+					self.tokens -= 1
+					return
+				await asyncio.sleep((1 - self.tokens) / self.rate)
+
+# Exponential backoff with full jitter so retries from many workers don't line up
+def backoff_delay(attempt, base=BACKOFF_BASE):
+	return random.uniform(0, base * (2 ** attempt))
+
+async def fetch_and_save_subcategory_async(url, idx, semaphore, buckets, save_dir=SAVE_DIR,
+		rate=RATE_PER_HOST, max_retries=MAX_RETRIES, manifest=None):
+	host = urlsplit(url).netloc
+	headers = conditional_headers(manifest, url, page_path(idx, save_dir))
+	if host not in buckets:
+		buckets[host] = TokenBucket(rate, BURST)
+	async with semaphore:
+		for attempt in range(max_retries + 1):
+			await buckets[host].acquire()
+			try:
+				# requests is blocking, so each fetch runs on a worker thread (sharing CLIENT's connection pool)
+				resp = await asyncio.to_thread(CLIENT.get, url, headers=headers)
+				if resp.status_code in RETRY_STATUSES:
+					raise requests.HTTPError(f"{resp.status_code} for {url}", response=resp)
+				resp.raise_for_status()
+				break
+			except (requests.ConnectionError, requests.Timeout, requests.HTTPError) as e:
+				status = getattr(e.response, "status_code", None)
+				if attempt == max_retries or (status is not None and status not in RETRY_STATUSES):
+					raise
+				delay = backoff_delay(attempt)
+				print(f"Retrying {url} in {delay:.2f}s ({e})")
+				await asyncio.sleep(delay)
+	status = record_page(manifest, url, idx, resp, save_dir)
+	print(f"{status.capitalize()}: {url} -> {page_path(idx, save_dir)}")
+	return status
+
+async def fetch_all_async(urls, save_dir=SAVE_DIR, concurrency=CONCURRENCY, rate=RATE_PER_HOST, manifest=None):
+	semaphore = asyncio.Semaphore(concurrency)
+	buckets = {}
+	tasks = [
+		fetch_and_save_subcategory_async(url, idx, semaphore, buckets, save_dir, rate, manifest=manifest)
+		for idx, url in enumerate(urls)
+	]
+	return await asyncio.gather(*tasks)
+
+# Records which files moved in this run so later stages can reprocess only those, and prints the totals
+def summarize_run(manifest, urls, statuses):
+	summary = {"new": [], "changed": [], "unchanged": []}
+	for url, status in zip(urls, statuses):
+		summary[status].append(manifest["pages"][url]["file"])
+	manifest["last_run"] = {
+		"finished_at": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+		"new": summary["new"],
+		"changed": summary["changed"],
+		"unchanged_count": len(summary["unchanged"]),
+	}
+	print(f"Crawl summary: {len(summary['changed'])} changed, {len(summary['unchanged'])} unchanged, {len(summary['new'])} new.")
+	return summary
+
+# Serves a directory of saved pages over HTTP on localhost, used as a stand-in for the catalog site
+@contextlib.contextmanager
+def serve_local_catalog(directory=SAVE_DIR):
+	class QuietHandler(http.server.SimpleHTTPRequestHandler):
+		extensions_map = {**http.server.SimpleHTTPRequestHandler.extensions_map, ".html": "text/html; charset=utf-8"}
+
+		def log_message(self, format, *args):
+			pass
+	handler = functools.partial(QuietHandler, directory=directory)
+	server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+	thread = threading.Thread(target=server.serve_forever, daemon=True)
+	thread.start()
+	try:
+		yield f"http://127.0.0.1:{server.server_address[1]}/"
+	finally:
+		server.shutdown()
+		server.server_close()
+
+# Compare the sequential loop (with its 1 second sleep) against async mode on the saved pages
+def benchmark(n_pages=20, concurrency=CONCURRENCY, rate=RATE_PER_HOST):
+	use_concurrency(concurrency)
+	pages = sorted(f for f in os.listdir(SAVE_DIR) if f.endswith(".html"))[:n_pages]
+	with serve_local_catalog(SAVE_DIR) as base:
+		urls = [base + page for page in pages]
+		with tempfile.TemporaryDirectory() as seq_dir, tempfile.TemporaryDirectory() as async_dir:
+			start = time.perf_counter()
+			for idx, url in enumerate(urls):
+				fetch_and_save_subcategory(url, idx, seq_dir)
+			seq_time = time.perf_counter() - start
+			start = time.perf_counter()
+			asyncio.run(fetch_all_async(urls, async_dir, concurrency, rate))
+			async_time = time.perf_counter() - start
+			identical = True
+			for fname in os.listdir(seq_dir):
+				with open(os.path.join(seq_dir, fname), encoding="utf-8") as a, open(os.path.join(async_dir, fname), encoding="utf-8") as b:
+					identical = identical and a.read() == b.read()
+	print(f"Sequential: {len(urls)} pages in {seq_time:.2f}s")
+	print(f"Async (concurrency={concurrency}, rate={rate}/s): {len(urls)} pages in {async_time:.2f}s")
+	print(f"Speedup: {seq_time / async_time:.1f}x, identical output: {identical}")
+
+def main(use_async=False, concurrency=CONCURRENCY, rate=RATE_PER_HOST):
+	use_concurrency(concurrency)
 	main_html = fetch_main_page()
 	subcat_links = parse_subcategory_links(main_html)
 	print(f"Found {len(subcat_links)} subcategories.")
-	for idx, url in enumerate(subcat_links):
-		fetch_and_save_subcategory(url, idx)
+	manifest = load_manifest()
+	if use_async:
+		statuses = asyncio.run(fetch_all_async(subcat_links, SAVE_DIR, concurrency, rate, manifest))
+	else:
+		statuses = [fetch_and_save_subcategory(url, idx, manifest=manifest) for idx, url in enumerate(subcat_links)]
+	summarize_run(manifest, subcat_links, statuses)
+	save_manifest(manifest)
+	CLIENT.print_stats()
 
 if __name__ == "__main__":
-	main()
-
+	parser = argparse.ArgumentParser(description="Download the Northeastern course catalog pages.")
+	parser.add_argument("--async", dest="use_async", action="store_true", help="fetch pages concurrently")
+	parser.add_argument("--concurrency", type=int, default=CONCURRENCY, help="max pages in flight (async mode)")
+	parser.add_argument("--rate", type=float, default=RATE_PER_HOST, help="requests per second per host (async mode)")
+	parser.add_argument("--bench", action="store_true", help="benchmark sequential vs async against a local server")
+	args = parser.parse_args()
+	if args.bench:
+		benchmark(concurrency=args.concurrency, rate=args.rate)
+	else:
+		main(args.use_async, args.concurrency, args.rate)
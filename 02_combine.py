@@ -7,18 +7,28 @@
 #  Tools/Resources: Concatenate HTML text using 
 #  python or javascript.
 # -----------------------------------------------
+import json
+import mmap
 import os
+import shutil
 
 # Directory where HTML files are stored (assumed from 01_pull.py output)
 HTML_DIR = "catalog_html" # the folder where HTML files are stored
 OUTPUT_FILE = "combined.html" # the name of the file where all HTML content will be combined
+INDEX_FILE = "combined_index.json" # sidecar index: byte offset and length of each source file inside OUTPUT_FILE
+BUFFER_SIZE = 1024 * 1024 # chunk size for the fallback copy when the kernel copy is unavailable
+
+# Files this script reads and writes (used by 09_pipeline.py to schedule it)
+INPUTS = [HTML_DIR]
+OUTPUTS = [OUTPUT_FILE, INDEX_FILE]
 
 # Step 1: Gather all HTML files from the HTML directory specified above
 # Runs a function to list HTML files 
+# Files are sorted so combined.html always has the same layout (os.listdir order is arbitrary)
 def get_html_files(directory):
-    """Return a list of HTML file paths in the given directory."""
-    return [os.path.join(directory, f) for f in os.listdir(directory)
-            if f.endswith('.html') and os.path.isfile(os.path.join(directory, f))]
+    """Return a sorted list of HTML file paths in the given directory."""
+    return sorted(os.path.join(directory, f) for f in os.listdir(directory)
+            if f.endswith('.html') and os.path.isfile(os.path.join(directory, f)))
 
 # Step 2: Concatenate the contents of all HTML files into a single output file
 # Each HTML file is opened, read, and written into the output file with a new line separating them for clarity
@@ -30,13 +40,57 @@ def concatenate_html_files(file_list, output_file):
                 outfile.write(infile.read())
                 outfile.write('\n')  # Separate files with a newline
 
+# Step 2 (streaming): copy the raw bytes of each file straight into the output without loading it into memory
+# os.sendfile lets the kernel do the copy; if that is not supported we fall back to fixed-size buffered copies
+# The bytes are copied as-is, so the offsets in the index are exact byte positions in combined.html
+def copy_file_into(infile, outfile):
+    """Append the contents of binary file infile to binary file outfile and return the number of bytes copied."""
+    length = os.fstat(infile.fileno()).st_size
+    outfile.flush()
+    copied = 0
+    try:
+        while copied < length:
+            sent = os.sendfile(outfile.fileno(), infile.fileno(), copied, length - copied)
+            if sent == 0:
+                break
+            copied += sent
+    except (AttributeError, OSError):
+        if copied:
+            raise
+        infile.seek(0)
+        shutil.copyfileobj(infile, outfile, BUFFER_SIZE)
+        copied = infile.tell()
+    return copied
+
+def concatenate_html_files_streaming(file_list, output_file, index_file=INDEX_FILE):
+    """Stream HTML files into a single output file and write a byte-offset index of each file's slice."""
+    index = []
+    with open(output_file, 'wb') as outfile:
+        for fname in file_list:
+            offset = outfile.tell()
+            with open(fname, 'rb') as infile:
+                length = copy_file_into(infile, outfile)
+            outfile.write(b'\n')  # Separate files with a newline
+            index.append({'file': os.path.basename(fname), 'offset': offset, 'length': length})
+    with open(index_file, 'w', encoding='utf-8') as f:
+        json.dump(index, f, indent=2)
+    return index
+
+# Helper for downstream tools: mmap combined.html and return just one source file's slice using the index
+def read_slice(name, combined_file=OUTPUT_FILE, index_file=INDEX_FILE):
+    """Return the HTML text of one source file (e.g. 'subcategory_012.html') from the combined file."""
+    with open(index_file, 'r', encoding='utf-8') as f:
+        entry = next(e for e in json.load(f) if e['file'] == name)
+    with open(combined_file, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        return mm[entry['offset']:entry['offset'] + entry['length']].decode('utf-8')
+
 # Main execution block: checks if script is being run directly and then executes the file gathering and concatenation process
 if __name__ == "__main__":
     html_files = get_html_files(HTML_DIR)
     if not html_files:
         print(f"No HTML files found in directory '{HTML_DIR}'.")
     else:
-        concatenate_html_files(html_files, OUTPUT_FILE)
-        print(f"Combined {len(html_files)} HTML files into '{OUTPUT_FILE}'.")
+        concatenate_html_files_streaming(html_files, OUTPUT_FILE, INDEX_FILE)
+        print(f"Combined {len(html_files)} HTML files into '{OUTPUT_FILE}' (index: '{INDEX_FILE}').")
 
 # Note: this file does not modify the HTML content, so the original structure of each file should be preserved
\ No newline at end of file
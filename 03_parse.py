@@ -17,6 +17,18 @@
 import os
 from bs4 import BeautifulSoup # Import Beautiful Soup for HTML parsing
 import re
+import sys
+import argparse
+import functools
+import hashlib
+import inspect
+import io
+import json
+import time
+import tracemalloc
+from html.parser import HTMLParser
+from concurrent.futures import ProcessPoolExecutor
+import columnar
 
 # Directory containing the consolidated HTML files
 HTML_DIR = 'catalog_html'
@@ -24,13 +36,67 @@ HTML_DIR = 'catalog_html'
 # Output file for parsed course data
 OUTPUT_FILE = 'parsed_courses.tsv'
 
-# In this function, I am aiming to extract the course number, title, credits, and description from the HTML content.
-def extract_course_info(soup):
-	"""
-	Extracts course information from a BeautifulSoup object.
-	Returns a list of dicts with keys: number, title, credits, description.
-	"""
+# Files this script reads and writes (used by 09_pipeline.py to schedule it)
+INPUTS = [HTML_DIR]
+OUTPUTS = [OUTPUT_FILE]
+
+# Column order used for the compact tuple records passed back from worker processes
+FIELDS = ('number', 'title', 'credits', 'description')
+
+# Parse cache: one JSON file of course records per HTML file, keyed by the file's content hash plus a
+# version stamp, so a cached entry is only reused for byte-identical input parsed by the same logic.
+# The source of the extraction code (EXTRACTION_CODE) is part of the stamp, so editing it invalidates the cache by itself;
+# bump PARSER_VERSION when output changes through anything else (e.g. a library upgrade).
+CACHE_DIR = 'parse_cache'
+CACHE_MAX_BYTES = 64 * 1024 * 1024
+PARSER_VERSION = 1
+
+# Streaming mode reads this many characters at a time
+STREAM_CHUNK_SIZE = 64 * 1024
+# Elements that never have an end tag, so they must not change any nesting depth
+VOID_TAGS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'source', 'track', 'wbr'}
+
+# Regex: ACCT 1201.  Financial Accounting and Reporting.  (4 Hours)
+TITLE_PAT = re.compile(r'^([A-Z]{2,4}\s*\d{3,4}[A-Z]?)\.\s*(.*?)\.\s*\((\d+(?:-\d+)?(?:\.\d+)?)\s*Hours?\)$')
+# Fallback: number and title only
+FALLBACK_PAT = re.compile(r'^([A-Z]{2,4}\s*\d{3,4}[A-Z]?)\.\s*(.*?)\.$')
+
+# Turn the text of one course block (the bold title line and the description) into a course dict
+# Returns None if the title line doesn't look like a course
+def course_from_block(title_str, description):
+	match = TITLE_PAT.match(title_str)
+	if match:
+		number, title, credits = match.groups()
+		return {
+			'number': number.strip(),
+			'title': title.strip(),
+			'credits': credits.strip(),
+			'description': description.strip()
+		}
+	fallback_match = FALLBACK_PAT.match(title_str)
+	if fallback_match:
+		number, title = fallback_match.groups()
+		return {
+			'number': number.strip(),
+			'title': title.strip(),
+			'credits': '',
+			'description': description.strip()
+		}
+	return None
+
+def courses_from_blocks(blocks):
 	courses = []
+	for title_str, description in blocks:
+		course = course_from_block(title_str, description)
+		if course:
+			courses.append(course)
+	return courses
+
+# Parser backends: each one finds every div.courseblock and yields (title text, description text),
+# where the title text is the <strong> inside p.courseblocktitle and the description is p.cb_desc.
+# Text is built like BeautifulSoup's get_text(strip=True): every text piece stripped, then joined with no separator.
+# Blocks without a bold title are skipped, and a missing description becomes ''.
+def iter_blocks_bs4(soup):
 	# Find all course blocks (div, tr, li with class containing 'course')
 	for courseblock in soup.find_all('div', class_='courseblock'):
 		title_tag = courseblock.find('p', class_='courseblocktitle')
@@ -38,57 +104,413 @@ def extract_course_info(soup):
 		if not title_tag or not title_tag.find('strong'):
 			continue
 		title_str = title_tag.find('strong').get_text(strip=True)
-		# Regex: ACCT 1201.  Financial Accounting and Reporting.  (4 Hours)
-		match = re.match(r'^([A-Z]{2,4}\s*\d{3,4}[A-Z]?)\.\s*(.*?)\.\s*\((\d+(?:-\d+)?(?:\.\d+)?)\s*Hours?\)$', title_str)
-		if match:
-			number, title, credits = match.groups()
-			description = desc_tag.get_text(strip=True) if desc_tag else ''
-			courses.append({
-				'number': number.strip(),
-				'title': title.strip(),
-				'credits': credits.strip(),
-				'description': description.strip()
-			})
-		else:
-			# Fallback: try to extract number and title only
-			fallback_match = re.match(r'^([A-Z]{2,4}\s*\d{3,4}[A-Z]?)\.\s*(.*?)\.$', title_str)
-			if fallback_match:
-				number, title = fallback_match.groups()
-				description = desc_tag.get_text(strip=True) if desc_tag else ''
-				courses.append({
-					'number': number.strip(),
-					'title': title.strip(),
-					'credits': '',
-					'description': description.strip()
-				})
-	return courses
+		yield title_str, desc_tag.get_text(strip=True) if desc_tag else ''
 
-# Iterate through all files in the HTML directory
-def parse_html_files():
-	all_courses = []
-	for fname in sorted(os.listdir(HTML_DIR)):
-		if not fname.endswith('.html'):
+def blocks_bs4(html):
+	return iter_blocks_bs4(BeautifulSoup(html, 'html.parser'))
+
+# lxml (C/libxml2): install with pip install lxml
+def _has_class(name):
+	return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+def blocks_lxml(html):
+	import lxml.html
+	def text_of(el):
+		return ''.join(t.strip() for t in el.itertext())
+	doc = lxml.html.fromstring(html)
+	for courseblock in doc.xpath(f"//div[{_has_class('courseblock')}]"):
+		title_tags = courseblock.xpath(f".//p[{_has_class('courseblocktitle')}]")
+		desc_tags = courseblock.xpath(f".//p[{_has_class('cb_desc')}]")
+		strong = title_tags[0].xpath('.//strong') if title_tags else []
+		if not strong:
+			continue
+		yield text_of(strong[0]), text_of(desc_tags[0]) if desc_tags else ''
+
+# selectolax (C/lexbor): install with pip install selectolax
+def blocks_selectolax(html):
+	from selectolax.lexbor import LexborHTMLParser
+	tree = LexborHTMLParser(html)
+	for courseblock in tree.css('div.courseblock'):
+		title_tag = courseblock.css_first('p.courseblocktitle')
+		desc_tag = courseblock.css_first('p.cb_desc')
+		strong = title_tag.css_first('strong') if title_tag else None
+		if strong is None:
 			continue
-		fpath = os.path.join(HTML_DIR, fname)
-		with open(fpath, 'r', encoding='utf-8') as f:
+		yield strong.text(deep=True, separator='', strip=True), desc_tag.text(deep=True, separator='', strip=True) if desc_tag else ''
+
+# Streaming (SAX-style) extraction: the stdlib HTMLParser fires an event per tag/text run and we only keep
+# state for the course block we're inside, so no DOM is ever built and memory doesn't grow with the input.
+# Text between two tags is buffered and stripped as one piece, which is how BeautifulSoup splits strings.
+class CourseBlockParser(HTMLParser):
+	def __init__(self):
+		super().__init__(convert_charrefs=True)
+		self.blocks = []  # finished (title, description) pairs not yet handed out
+		self.block_depth = 0  # div nesting depth inside the current courseblock (0 = not in one)
+		self.capture = None  # 'title' or 'desc' while inside the element being captured
+		self.capture_tag = None
+		self.capture_depth = 0
+		self.text = []  # text of the current run between two tags
+		self.reset_block()
+
+	def reset_block(self):
+		self.in_title_p = False
+		self.title = None
+		self.desc = None
+		self.pieces = []
+
+	@staticmethod
+	def has_class(attrs, name):
+		for key, value in attrs:
+			if key == 'class' and value and name in value.split():
+				return True
+		return False
+
+	def flush_text(self):
+		if self.text:
+			if self.capture:
+				piece = ''.join(self.text).strip()
+				if piece:
+					self.pieces.append(piece)
+			self.text = []
+
+	def handle_starttag(self, tag, attrs):
+		self.flush_text()
+		if tag in VOID_TAGS:
+			return
+		if self.block_depth == 0:
+			if tag == 'div' and self.has_class(attrs, 'courseblock'):
+				self.block_depth = 1
+				self.reset_block()
+			return
+		if tag == 'div':
+			self.block_depth += 1
+		if self.capture:
+			if tag == self.capture_tag:
+				self.capture_depth += 1
+			return
+		if tag == 'p' and not self.in_title_p and self.title is None and self.has_class(attrs, 'courseblocktitle'):
+			self.in_title_p = True
+		elif tag == 'strong' and self.in_title_p and self.title is None:
+			self.start_capture('title', tag)
+		elif tag == 'p' and self.desc is None and self.has_class(attrs, 'cb_desc'):
+			self.start_capture('desc', tag)
+
+	def start_capture(self, kind, tag):
+		self.capture = kind
+		self.capture_tag = tag
+		self.capture_depth = 1
+		self.pieces = []
+
+	def handle_startendtag(self, tag, attrs):
+		self.flush_text()
+
+	def handle_endtag(self, tag):
+		self.flush_text()
+		if self.block_depth == 0:
+			return
+		if self.capture and tag == self.capture_tag:
+			self.capture_depth -= 1
+			if self.capture_depth == 0:
+				setattr(self, self.capture, ''.join(self.pieces))
+				self.capture = None
+		if tag == 'p' and self.in_title_p and not self.capture:
+			self.in_title_p = False
+		if tag == 'div':
+			self.block_depth -= 1
+			if self.block_depth == 0:
+				if self.capture:
+					setattr(self, self.capture, ''.join(self.pieces))
+					self.capture = None
+				if self.title is not None:
+					self.blocks.append((self.title, self.desc or ''))
+				self.reset_block()
+
+	def handle_data(self, data):
+		if self.capture:
+			self.text.append(data)
+
+	def handle_comment(self, data):
+		self.flush_text()
+
+# Feed a file (or any text stream, e.g. combined.html) through the event parser in fixed-size chunks,
+# yielding (title, description) as each courseblock closes
+def iter_blocks_streaming(fileobj, chunk_size=STREAM_CHUNK_SIZE):
+	parser = CourseBlockParser()
+	while True:
+		chunk = fileobj.read(chunk_size)
+		if not chunk:
+			break
+		parser.feed(chunk)
+		yield from parser.blocks
+		parser.blocks.clear()
+	parser.close()
+	yield from parser.blocks
+
+def blocks_stream(html):
+	return iter_blocks_streaming(io.StringIO(html))
+
+# Course records, one at a time, from a single HTML stream
+def iter_courses_streaming(fpath, chunk_size=STREAM_CHUNK_SIZE):
+	with open(fpath, 'r', encoding='utf-8') as f:
+		for title_str, description in iter_blocks_streaming(f, chunk_size):
+			course = course_from_block(title_str, description)
+			if course:
+				yield course
+
+BACKENDS = {
+	'bs4': blocks_bs4,
+	'lxml': blocks_lxml,
+	'selectolax': blocks_selectolax,
+	'stream': blocks_stream,
+}
+
+# In this function, I am aiming to extract the course number, title, credits, and description from the HTML content.
+def extract_course_info(soup):
+	"""
+	Extracts course information from a BeautifulSoup object.
+	Returns a list of dicts with keys: number, title, credits, description.
+	"""
+	return courses_from_blocks(iter_blocks_bs4(soup))
+
+# The HTML files to parse, in the sorted order the output is written in
+def list_html_files(directory=HTML_DIR):
+	return [os.path.join(directory, fname) for fname in sorted(os.listdir(directory)) if fname.endswith('.html')]
+
+# Parse one HTML file and return its courses as a list of dicts
+def parse_file(fpath, backend='bs4'):
+	if backend == 'stream':
+		return list(iter_courses_streaming(fpath))
+	with open(fpath, 'r', encoding='utf-8') as f:
+		if backend == 'bs4':
 			soup = BeautifulSoup(f, 'html.parser')
-			courses = extract_course_info(soup) # calling the function defined earlier
-			all_courses.extend(courses)
+			return extract_course_info(soup) # calling the function defined earlier
+		return courses_from_blocks(BACKENDS[backend](f.read()))
+
+# Worker-side version of parse_file: tuples are much cheaper to pickle back to the parent than dicts
+def parse_file_records(fpath, backend='bs4'):
+	return [tuple(c[k] for k in FIELDS) for c in parse_file(fpath, backend)]
+
+# Iterate through all files in the HTML directory
+def parse_html_files(backend='bs4'):
+	all_courses = []
+	for fpath in list_html_files():
+		all_courses.extend(parse_file(fpath, backend))
+	return all_courses
+
+# Parallel version: spreads the files over a process pool
+# executor.map returns results in submission order, so the merged list is in the same sorted-file order as parse_html_files
+def parse_html_files_parallel(workers=None, files=None, backend='bs4'):
+	files = files if files is not None else list_html_files()
+	all_courses = []
+	with ProcessPoolExecutor(max_workers=workers) as executor:
+		for records in executor.map(functools.partial(parse_file_records, backend=backend), files, chunksize=4):
+			all_courses.extend(dict(zip(FIELDS, rec)) for rec in records)
 	return all_courses
 
+# The code each backend's records come from, on top of the shared course_from_block/courses_from_blocks/parse_file
+EXTRACTION_CODE = {
+	'bs4': (iter_blocks_bs4, blocks_bs4, extract_course_info),
+	'lxml': (_has_class, blocks_lxml),
+	'selectolax': (blocks_selectolax,),
+	'stream': (CourseBlockParser, iter_blocks_streaming, blocks_stream, iter_courses_streaming),
+}
+
+# Hash of the source of a backend's extraction code (computed once per process; cache_key runs for every file)
+@functools.lru_cache(maxsize=None)
+def extraction_digest(backend):
+	h = hashlib.sha256()
+	for code in (course_from_block, courses_from_blocks, parse_file) + EXTRACTION_CODE[backend]:
+		h.update(inspect.getsource(code).encode('utf-8'))
+	return h.hexdigest()[:16]
+
+# Version stamp mixed into every cache key; the regexes and the extraction code are included so editing them invalidates
+# the cache automatically, and so is the backend, so each backend's records are cached (and reused) separately
+def parser_stamp(backend='bs4'):
+	return f"{PARSER_VERSION}:{backend}:{TITLE_PAT.pattern}:{FALLBACK_PAT.pattern}:{extraction_digest(backend)}"
+
+def cache_key(fpath, backend='bs4'):
+	h = hashlib.sha256(parser_stamp(backend).encode('utf-8'))
+	with open(fpath, 'rb') as f:
+		h.update(f.read())
+	return h.hexdigest()
+
+def cache_path(key, cache_dir=CACHE_DIR):
+	return os.path.join(cache_dir, f"{key}.json")
+
+# Returns the cached records for this key, or None on a miss
+# A hit refreshes the entry's modification time, which is what eviction uses as "last used"
+def load_cached(key, cache_dir=CACHE_DIR):
+	path = cache_path(key, cache_dir)
+	try:
+		with open(path, 'r', encoding='utf-8') as f:
+			records = [tuple(rec) for rec in json.load(f)]
+	except (OSError, ValueError):
+		return None
+	os.utime(path)
+	return records
+
+def store_cached(key, records, cache_dir=CACHE_DIR):
+	os.makedirs(cache_dir, exist_ok=True)
+	tmp = cache_path(key, cache_dir) + '.tmp'
+	with open(tmp, 'w', encoding='utf-8') as f:
+		json.dump(records, f, ensure_ascii=False)
+	os.replace(tmp, cache_path(key, cache_dir))
+
+# Least-recently-used eviction: delete the oldest entries until the cache fits in max_bytes
+def evict_cache(cache_dir=CACHE_DIR, max_bytes=CACHE_MAX_BYTES):
+	if not os.path.isdir(cache_dir):
+		return 0
+	entries = []
+	for fname in os.listdir(cache_dir):
+		if fname.endswith('.json'):
+			st = os.stat(os.path.join(cache_dir, fname))
+			entries.append((st.st_mtime, st.st_size, fname))
+	total = sum(size for _, size, _ in entries)
+	evicted = 0
+	for _, size, fname in sorted(entries):
+		if total <= max_bytes:
+			break
+		os.remove(os.path.join(cache_dir, fname))
+		total -= size
+		evicted += 1
+	return evicted
+
+# Cached version of parse_html_files: only files whose content (or the parser) changed are actually parsed
+def parse_html_files_cached(backend='bs4', workers=0, cache_dir=CACHE_DIR):
+	files = list_html_files()
+	keys = [cache_key(fpath, backend) for fpath in files]
+	results = [load_cached(key, cache_dir) for key in keys]
+	misses = [i for i, records in enumerate(results) if records is None]
+	if misses:
+		if workers:
+			with ProcessPoolExecutor(max_workers=workers) as executor:
+				parsed = list(executor.map(functools.partial(parse_file_records, backend=backend), [files[i] for i in misses], chunksize=4))
+		else:
+			parsed = [parse_file_records(files[i], backend) for i in misses]
+		for i, records in zip(misses, parsed):
+			results[i] = records
+			store_cached(keys[i], records, cache_dir)
+		evict_cache(cache_dir)
+	print(f"Parse cache: {len(files) - len(misses)} hits, {len(misses)} misses")
+	return [dict(zip(FIELDS, rec)) for records in results for rec in records]
+
+# Re-parse every file from scratch and compare against what the cache holds for it
+def verify_cache(backend='bs4', cache_dir=CACHE_DIR):
+	checked = mismatched = 0
+	for fpath in list_html_files():
+		cached = load_cached(cache_key(fpath, backend), cache_dir)
+		if cached is None:
+			continue
+		checked += 1
+		if cached != parse_file_records(fpath, backend):
+			mismatched += 1
+			print(f"Cache mismatch: {fpath}")
+	print(f"Verified {checked} cached files, {mismatched} mismatched")
+	return mismatched == 0
+
 # Take the list of courses and write them to a tab-separated values file
 # Organization: the first line is the header (number, title, credits, description), followed by one line per course with the corresponding data separated by tabs
-def save_courses(courses, out_file):
+# With write_columnar=True the same rows also go to a Parquet file next to the TSV (see columnar.py), written a row
+# group at a time as the courses stream past, so a streamed input still isn't held in memory
+def save_courses(courses, out_file, write_columnar=False):
+	count = 0
+	parquet = columnar.CourseWriter(out_file) if write_columnar else None
 	with open(out_file, 'w', encoding='utf-8') as f:
 		f.write('number\ttitle\tcredits\tdescription\n')
 		for c in courses:
 			f.write(f"{c['number']}\t{c['title']}\t{c['credits']}\t{c['description']}\n")
+			count += 1
+			if parquet:
+				parquet.write([c[k] for k in FIELDS])
+	if parquet:
+		parquet.close()
+	return count
+
+# Time the parse with 1 worker (the plain sequential loop) and then with increasing pool sizes
+# Use this to see how many cores are worth paying for
+def benchmark(max_workers=None):
+	max_workers = max_workers or os.cpu_count() or 1
+	start = time.perf_counter()
+	baseline = parse_html_files()
+	seq_time = time.perf_counter() - start
+	print(f"sequential: {seq_time:.2f}s ({len(baseline)} courses)")
+	workers = 1
+	while True:
+		start = time.perf_counter()
+		courses = parse_html_files_parallel(workers)
+		elapsed = time.perf_counter() - start
+		print(f"workers={workers}: {elapsed:.2f}s, speedup {seq_time / elapsed:.2f}x, identical: {courses == baseline}")
+		if workers >= max_workers:
+			break
+		workers = min(workers * 2, max_workers)
+
+# Throughput of each installed backend over the whole corpus (the regex step is shared, so this is mostly parse time)
+def benchmark_backends():
+	files = list_html_files()
+	total_bytes = sum(os.path.getsize(fpath) for fpath in files)
+	for backend in BACKENDS:
+		try:
+			start = time.perf_counter()
+			courses = parse_html_files(backend)
+			elapsed = time.perf_counter() - start
+		except ImportError as e:
+			print(f"{backend}: not installed ({e})")
+			continue
+		print(f"{backend}: {elapsed:.2f}s, {len(files) / elapsed:.1f} pages/s, "
+			f"{total_bytes / 1e6 / elapsed:.1f} MB/s, {len(courses)} courses")
+
+# Peak Python memory of a full bs4 parse of the largest page vs streaming the same page and the whole combined document
+def benchmark_memory(combined_file='combined.html'):
+	largest = max(list_html_files(), key=os.path.getsize)
+	# Records are counted and dropped as they arrive, so only the parser's own memory is measured
+	def peak(fn):
+		tracemalloc.start()
+		count = sum(1 for _ in fn())
+		peak = tracemalloc.get_traced_memory()[1]
+		tracemalloc.stop()
+		return count, peak
+	runs = [
+		(f"bs4 {os.path.basename(largest)}", lambda: parse_file(largest, 'bs4')),
+		(f"stream {os.path.basename(largest)}", lambda: iter_courses_streaming(largest)),
+	]
+	if os.path.exists(combined_file):
+		runs.append((f"stream {combined_file}", lambda: iter_courses_streaming(combined_file)))
+	for label, fn in runs:
+		count, peak_bytes = peak(fn)
+		print(f"{label}: {count} courses, peak {peak_bytes / 1e6:.2f} MB")
 
 # Execute the function and save courses to the ouptut file
-def main():
-	courses = parse_html_files()
-	save_courses(courses, OUTPUT_FILE)
-	print(f"Extracted {len(courses)} courses to {OUTPUT_FILE}") # Confirmation message
+# With input_file set (e.g. combined.html), that single document is streamed instead of the HTML directory
+def main(workers=0, backend='bs4', input_file=None, use_cache=True):
+	if input_file:
+		courses = iter_courses_streaming(input_file)
+	elif use_cache:
+		courses = parse_html_files_cached(backend, workers)
+	elif workers:
+		courses = parse_html_files_parallel(workers, backend=backend)
+	else:
+		courses = parse_html_files(backend)
+	count = save_courses(courses, OUTPUT_FILE, write_columnar=True)
+	print(f"Extracted {count} courses to {OUTPUT_FILE}") # Confirmation message
 
 if __name__ == '__main__':
-	main()
+	parser = argparse.ArgumentParser(description='Parse course blocks from the saved catalog HTML.')
+	parser.add_argument('--workers', type=int, default=0, help='parse with a process pool of this many workers (0 = sequential)')
+	parser.add_argument('--backend', choices=sorted(BACKENDS), default='bs4', help='HTML parser backend (default: bs4)')
+	parser.add_argument('--bench', action='store_true', help='benchmark speedup vs number of workers')
+	parser.add_argument('--input', help='stream a single HTML document (e.g. combined.html) instead of the HTML directory')
+	parser.add_argument('--bench-backends', action='store_true', help='benchmark throughput of each parser backend')
+	parser.add_argument('--bench-memory', action='store_true', help='compare peak memory of bs4 vs streaming extraction')
+	parser.add_argument('--no-cache', action='store_true', help=f'ignore the parse cache in {CACHE_DIR}/ and parse every file')
+	parser.add_argument('--verify-cache', action='store_true', help='re-parse every file and check it against the parse cache')
+	args = parser.parse_args()
+	if args.verify_cache:
+		sys.exit(0 if verify_cache(args.backend) else 1)
+	elif args.bench:
+		benchmark()
+	elif args.bench_backends:
+		benchmark_backends()
+	elif args.bench_memory:
+		benchmark_memory()
+	else:
+		main(args.workers, args.backend, args.input, not args.no_cache)
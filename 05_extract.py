@@ -9,20 +9,31 @@
 # I identified course titles from the HTML files by recoginizing that they were bold and followed a specific pattern (course number, title, credits in parentheses)
 # This made it easy to extract just the course titles in this step by reading the cleaned TSV 
 
-import csv
+import columnar
 
 INPUT_FILE = 'cleaned_courses.tsv'
 OUTPUT_FILE = 'course_titles.txt'
 
+# Files this script reads and writes (used by 09_pipeline.py to schedule it)
+INPUTS = [INPUT_FILE]
+OUTPUTS = [OUTPUT_FILE]
+
+# Formats one course as "NUMBER: Title", or returns None if either part is missing
+def title_line(number, title):
+	number = number.strip()
+	title = title.strip()
+	if number and title:
+		return f"{number}: {title}"
+	return None
+
+# Only the number and title columns are needed, so they're read from the Parquet copy when there is one (see columnar.py)
 def extract_course_titles():
 	course_titles = []
-	with open(INPUT_FILE, 'r', encoding='utf-8') as f:
-		reader = csv.DictReader(f, delimiter='\t')
-		for row in reader:
-			number = row['number'].strip()
-			title = row['title'].strip()
-			if number and title:
-				course_titles.append(f"{number}: {title}")
+	columns = columnar.read_columns(INPUT_FILE, ['number', 'title'])
+	for number, title in zip(columns['number'], columns['title']):
+		line = title_line(number, title)
+		if line:
+			course_titles.append(line)
 	return course_titles
 
 def save_titles(titles, out_file):
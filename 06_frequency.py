@@ -9,28 +9,54 @@
 # -----------------------------------------------
 
 # Word Frequency Analysis on course_titles.txt using MapReduce approach
-import string
-from collections import Counter
-
-# Define a set of common English stopwords
-STOPWORDS = set([
-	'the', 'and', 'in', 'of', 'to', 'a', 'for', 'on', 'with', 'at', 'by', 'an', 'be', 'is', 'as', 'from', 'that',
-	'this', 'it', 'are', 'or', 'was', 'but', 'not', 'which', 'into', 'can', 'has', 'have', 'will', 'its', 'if', 'their',
-	'also', 'we', 'our', 'they', 'you', 'all', 'more', 'than', 'one', 'about', 'so', 'do', 'no', 'may', 'such', 'these',
-	'out', 'up', 'use', 'used', 'using', 'each', 'other', 'new', 'some', 'most', 'any', 'who', 'what', 'when', 'where',
-	'how', 'why', 'been', 'being', 'through', 'over', 'under', 'between', 'both', 'after', 'before', 'during', 'while',
-	'per', 'upon', 'within', 'without', 'like', 'just', 'should', 'could', 'would', 'very', 'much', 'many', 'them', 'he', 'she', 'his', 'her', 'i', 'me', 'my', 'your', 'yours', 'ours', 'theirs', 'him', 'hers', 'itself', 'themselves', 'ourselves', 'yourself', 'yourselves'
-])
+# The input is streamed in chunks of lines; each chunk is counted into its own Counter (the combiner)
+# in a process pool, and the per-chunk counts are merged in order. At most a few chunks are in flight at once,
+# so memory stays bounded however large the input is.
+# Usage: python 06_frequency.py                          (course titles -> word_frequencies.json)
+#        python 06_frequency.py --source descriptions    (cleaned_courses.tsv descriptions -> description_word_frequencies.json)
+#        python 06_frequency.py --workers 4 --chunk-lines 2000
+#        python 06_frequency.py --bench --source descriptions
+# Phrase mode: bigram/trigram counts in fixed memory (count-min sketch + Space-Saving, see sketches.py)
+#        python 06_frequency.py --ngrams 2 --source descriptions --top 25 --epsilon 0.0005 --delta 0.01
+#        python 06_frequency.py --ngrams 3 --source mit_2026 --bench      (compare against exact counts)
+import argparse
+import itertools
+import json
+import os
+import time
+import tracemalloc
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+import sketches
+import tokenizer
+
+# Files this script reads and writes (used by 09_pipeline.py to schedule it)
+INPUTS = ['course_titles.txt']
+OUTPUTS = ['word_frequencies.json']
+
+# What can be counted: input file, how to get the text out of it (whole lines, a TSV column number
+# or a JSON field name), and where the word counts go
+SOURCES = {
+	'titles': ('course_titles.txt', None, 'word_frequencies.json'),
+	'descriptions': ('cleaned_courses.tsv', 3, 'description_word_frequencies.json'),  # 4th TSV column
+	'mit_1996': ('10_mit_1996.json', 'title', 'mit_1996_word_frequencies.json'),
+	'mit_2026': ('11_mit_2026.json', 'title', 'mit_2026_word_frequencies.json'),
+}
+CHUNK_LINES = 2000
+
+# Phrase mode defaults: count-min error epsilon * total n-grams with probability 1 - delta
+NGRAM_EPSILON = 0.0005
+NGRAM_DELTA = 0.01
+TOP_PHRASES = 20
+
+# Common English stopwords and the rest of the word rules live in tokenizer.py (the 'catalog' profile)
+STOPWORDS = tokenizer.CATALOG_STOPWORDS
 
 # Define a function to preprocess the text
 def preprocess(text):
-	# Lowercase, remove punctuation, split into words, remove stopwords
-	text = text.lower() # convert all words to lowercase so capitalizaiton doesn't affect the count
-	text = text.translate(str.maketrans('', '', string.punctuation))
-	words = text.split()
-	# Exclude stopwords and words that are purely numeric
-	# I added this in because there was "1" and "2" being counted as common words in course titles
-	return [word for word in words if word not in STOPWORDS and not word.isdigit()]
+	# Lowercase, remove punctuation, split into words, remove stopwords and words that are purely numeric
+	# (numbers were dropped because "1" and "2" were being counted as common words in course titles)
+	return tokenizer.tokenize(text, 'catalog')
 
 # Employ a MapReduce style approach to count word frequencies
 def map_words(lines):
@@ -47,22 +73,165 @@ def reduce_word_counts(pairs):
 		counter[word] += count
 	return counter
 
-def main():
-	with open('course_titles.txt', 'r', encoding='utf-8') as f:
-		lines = f.readlines()
-	# Map
-	mapped = list(map_words(lines))
-	# Reduce
-	word_counts = reduce_word_counts(mapped)
+# Map + combine for one chunk of lines: a Counter holding that chunk's word counts
+# (the whole chunk is tokenized in one call, which gives the same words in the same order as map_words)
+# Counter keeps first-seen order, so merging the chunks in order gives the same key order as one big pass
+def count_chunk(lines):
+	return Counter(tokenizer.tokenize_batch(lines, 'catalog'))
+
+# Lines of the chosen source, streamed from disk (for the TSV, just the text column of each data row)
+def read_lines(source='titles'):
+	path, column, _ = SOURCES[source]
+	with open(path, 'r', encoding='utf-8') as f:
+		if column is None:
+			yield from f
+			return
+		if isinstance(column, str):
+			for item in json.load(f):
+				yield item.get(column, '')
+			return
+		f.readline()  # header
+		for line in f:
+			yield line.rstrip('\n').split('\t')[column]
+
+def iter_chunks(lines, chunk_lines=CHUNK_LINES):
+	lines = iter(lines)
+	while True:
+		chunk = list(itertools.islice(lines, chunk_lines))
+		if not chunk:
+			return
+		yield chunk
+
+# Map-reduce over chunks: workers=1 counts in this process, otherwise chunks go to a process pool
+# with at most 2 chunks per worker in flight (Executor.map would read the whole input up front)
+def count_words(lines, workers=None, chunk_lines=CHUNK_LINES):
+	workers = workers or os.cpu_count() or 1
+	word_counts = Counter()
+	chunks = iter_chunks(lines, chunk_lines)
+	if workers == 1:
+		for chunk in chunks:
+			word_counts.update(count_chunk(chunk))
+		return word_counts
+	with ProcessPoolExecutor(max_workers=workers) as executor:
+		pending = deque()
+		for chunk in chunks:
+			pending.append(executor.submit(count_chunk, chunk))
+			if len(pending) >= 2 * workers:
+				word_counts.update(pending.popleft().result())
+		while pending:
+			word_counts.update(pending.popleft().result())
+	return word_counts
+
+# The original approach (read every line, list every (word, 1) pair, one core) against the chunked engine streaming from disk
+def benchmark(source='titles', workers=None, chunk_lines=CHUNK_LINES):
+	workers = workers or os.cpu_count() or 1
+	def original():
+		return reduce_word_counts(list(map_words(list(read_lines(source)))))
+	runs = [('list of pairs, 1 core', original)]
+	for n in sorted({1, workers}):
+		runs.append((f"chunked, {n} worker(s)", lambda n=n: count_words(read_lines(source), n, chunk_lines)))
+	reference = None
+	for label, fn in runs:
+		tracemalloc.start()
+		start = time.perf_counter()
+		counts = fn()
+		elapsed = time.perf_counter() - start
+		peak = tracemalloc.get_traced_memory()[1]
+		tracemalloc.stop()
+		if reference is None:
+			reference = counts
+			print(f"{source}: {sum(counts.values())} words, {len(counts)} distinct")
+		same = list(counts.items()) == list(reference.items())
+		print(f"{label}: {elapsed:.2f}s, peak memory {peak / 1e6:.1f} MB, identical: {same}")
+
+# Phrases of n words from each line (never across lines). Stopwords stay inside phrases ("history of science")
+# but a phrase can't start or end with one, and phrases with a bare number are skipped like single numbers are
+def iter_ngrams(lines, n):
+	for line in lines:
+		words = tokenizer.strip_punctuation(line.lower()).split()
+		for i in range(len(words) - n + 1):
+			gram = words[i:i + n]
+			if gram[0] in STOPWORDS or gram[-1] in STOPWORDS or any(word.isdigit() for word in gram):
+				continue
+			yield ' '.join(gram)
+
+def count_ngrams(lines, n=2, epsilon=NGRAM_EPSILON, delta=NGRAM_DELTA, capacity=None):
+	phrases = sketches.TopPhrases(epsilon, delta, capacity)
+	for gram in iter_ngrams(lines, n):
+		phrases.add(gram)
+	return phrases
+
+def ngrams_main(source='descriptions', n=2, top=TOP_PHRASES, epsilon=NGRAM_EPSILON, delta=NGRAM_DELTA, capacity=None):
+	phrases = count_ngrams(read_lines(source), n, epsilon, delta, capacity)
+	results = phrases.top(top)
+	print(f"{source}: {phrases.total} {n}-grams; count-min {phrases.sketch.depth}x{phrases.sketch.width} "
+		f"({phrases.sketch.nbytes() / 1e3:.0f} KB, error <= {phrases.sketch.error_bound():.1f} with p={1 - delta}), "
+		f"Space-Saving {phrases.heavy.capacity} counters")
+	for phrase, count, error in results:
+		print(f"{phrase}: {count}" + (f" (+0/-{error})" if error else ''))
+	out_file = f"{source}_{n}gram_frequencies.json"
+	with open(out_file, 'w', encoding='utf-8') as f:
+		json.dump({
+			'source': source, 'n': n, 'total': phrases.total,
+			'epsilon': epsilon, 'delta': delta, 'capacity': phrases.heavy.capacity,
+			'top': [{'phrase': phrase, 'count': count, 'error': error} for phrase, count, error in results],
+		}, f, ensure_ascii=False, indent=2)
+
+# Sketch answers against exact n-gram counts: how many of the true top k it finds, worst error, and peak memory of each
+def benchmark_ngrams(source='descriptions', n=2, top=TOP_PHRASES, epsilon=NGRAM_EPSILON, delta=NGRAM_DELTA, capacity=None):
+	runs = {
+		'exact Counter': lambda: Counter(iter_ngrams(read_lines(source), n)),
+		'sketches': lambda: count_ngrams(read_lines(source), n, epsilon, delta, capacity),
+	}
+	results = {}
+	for label, fn in runs.items():
+		start = time.perf_counter()
+		results[label] = fn()
+		elapsed = time.perf_counter() - start
+		# Timed without tracing (tracemalloc slows the sketches down far more than the Counter), then traced for memory
+		tracemalloc.start()
+		fn()
+		peak = tracemalloc.get_traced_memory()[1]
+		tracemalloc.stop()
+		print(f"{label}: {elapsed:.2f}s, peak memory {peak / 1e6:.1f} MB")
+	exact, phrases = results['exact Counter'], results['sketches']
+	top_phrases = phrases.top(top)
+	true_top = {phrase for phrase, _ in exact.most_common(top)}
+	found = sum(phrase in true_top for phrase, _, _ in top_phrases)
+	worst = max((count - exact[phrase] for phrase, count, _ in top_phrases), default=0)
+	in_bounds = all(count - error <= exact[phrase] <= count for phrase, count, error in top_phrases)
+	print(f"{source}: {phrases.total} {n}-grams, {len(exact)} distinct")
+	print(f"top {top}: {found}/{len(true_top)} of the true top {top} found, worst overcount {worst}, "
+		f"every true count within the reported bounds: {in_bounds}")
+
+def main(source='titles', workers=None, chunk_lines=CHUNK_LINES):
+	word_counts = count_words(read_lines(source), workers, chunk_lines)
 	# Print top 20 most common words
 	for word, count in word_counts.most_common(20):
 		print(f'{word}: {count}')
 	# Save all word frequencies to a JSON file for visualization
-	import json
-	with open('word_frequencies.json', 'w', encoding='utf-8') as f:
+	out_file = SOURCES[source][2]
+	with open(out_file, 'w', encoding='utf-8') as f:
 		json.dump(dict(word_counts), f, ensure_ascii=False, indent=2)
 
 if __name__ == '__main__':
-	main()
+	parser = argparse.ArgumentParser(description='Count word frequencies in course titles or descriptions.')
+	parser.add_argument('--source', choices=list(SOURCES), default='titles', help='what to count')
+	parser.add_argument('--workers', type=int, default=None, help='processes to count with (default: one per CPU)')
+	parser.add_argument('--chunk-lines', type=int, default=CHUNK_LINES, help='lines per map task')
+	parser.add_argument('--bench', action='store_true', help='compare the original list-based count with the chunked engine (or, with --ngrams, the sketches with exact counts)')
+	parser.add_argument('--ngrams', type=int, default=None, help='count phrases of this many words instead of single words')
+	parser.add_argument('--top', type=int, default=TOP_PHRASES, help='phrases to report (phrase mode)')
+	parser.add_argument('--epsilon', type=float, default=NGRAM_EPSILON, help='count-min error as a fraction of all n-grams (phrase mode)')
+	parser.add_argument('--delta', type=float, default=NGRAM_DELTA, help='probability the count-min error bound is exceeded (phrase mode)')
+	parser.add_argument('--capacity', type=int, default=None, help='Space-Saving counters (phrase mode, default 1/epsilon)')
+	args = parser.parse_args()
+	if args.ngrams:
+		run = benchmark_ngrams if args.bench else ngrams_main
+		run(args.source, args.ngrams, args.top, args.epsilon, args.delta, args.capacity)
+	elif args.bench:
+		benchmark(args.source, args.workers, args.chunk_lines)
+	else:
+		main(args.source, args.workers, args.chunk_lines)
 
 
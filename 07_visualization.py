@@ -14,6 +14,10 @@
 # Visualization of Word Frequencies using Google Charts
 import json
 
+# Files this script reads and writes (used by 09_pipeline.py to schedule it)
+INPUTS = ['word_frequencies.json']
+OUTPUTS = ['word_frequencies_chart.html']
+
 def load_word_frequencies(filename):
 	"""
 	Loads the word frequency data from 06_frequency.py output.
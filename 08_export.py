@@ -24,20 +24,250 @@
 # This script exports the cleaned, well-formatted dataset of the entire university catalog.
 # It uses the output from 04_clean.py (cleaned_courses.tsv), which includes all information (number, title, credits, description).
 # The export is written as a CSV file for easy use in analysis and visualization.
+#
+# It can also write other formats in the same pass: the input is read once, in chunks, and every chunk
+# is handed to each requested sink (CSV, JSON Lines, gzip/zstd CSV, SQLite, Parquet).
+# Usage: python 08_export.py                          (CSV only, as before)
+#        python 08_export.py --formats csv,jsonl,sqlite
+#        python 08_export.py --all
+#        python 08_export.py --bench                  (all formats, with time and size per format)
+# When formats other than plain CSV are asked for, the column layout of each is written to catalog_export.schema.json.
 
+import argparse
 import csv
+import gzip
+import io
+import itertools
+import json
+import os
+import sqlite3
+import time
+import columnar
 
 INPUT_FILE = 'cleaned_courses.tsv'
 EXPORT_FILE = 'catalog_export.csv'
+SCHEMA_FILE = 'catalog_export.schema.json'
+FIELDS = ['number', 'title', 'credits', 'description']
+CHUNK_ROWS = 1000
 
-def export_cleaned_catalog():
-	with open(INPUT_FILE, 'r', encoding='utf-8') as fin, open(EXPORT_FILE, 'w', encoding='utf-8', newline='') as fout:
-		reader = (line.rstrip('\n').split('\t') for line in fin)
-		writer = csv.writer(fout)
-		for row in reader:
-			writer.writerow(row)
-	print(f"Exported cleaned catalog to {EXPORT_FILE}")
+# Files this script reads and writes (used by 09_pipeline.py to schedule it)
+INPUTS = [INPUT_FILE]
+OUTPUTS = [EXPORT_FILE]
 
-if __name__ == '__main__':
-	export_cleaned_catalog()
+# Columns of the typed exports (JSON Lines, SQLite, Parquet). subject and credits_min/max are derived from number and credits.
+COLUMNS = [
+	{'name': 'number', 'type': 'string', 'description': "Course number, e.g. 'ACCT 1201'"},
+	{'name': 'subject', 'type': 'string', 'description': "Subject code from the course number, e.g. 'ACCT'"},
+	{'name': 'title', 'type': 'string', 'description': 'Course title'},
+	{'name': 'credits', 'type': 'string', 'description': "Credit hours as printed in the catalog, e.g. '4' or '1-4'"},
+	{'name': 'credits_min', 'type': 'float', 'description': 'Lower end of the credit hours'},
+	{'name': 'credits_max', 'type': 'float', 'description': 'Upper end of the credit hours (same as credits_min unless a range)'},
+	{'name': 'description', 'type': 'string', 'description': 'Course description'},
+]
+
+# Rows of the input in lists of up to CHUNK_ROWS, without the header
+# Reads the four original columns from the Parquet copy of the cleaned data when it's up to date (see columnar.py)
+def iter_chunks(in_file=INPUT_FILE, chunk_rows=CHUNK_ROWS):
+	if columnar.is_fresh(in_file):
+		parquet_file = columnar.pq.ParquetFile(columnar.parquet_path(in_file))
+		for batch in parquet_file.iter_batches(batch_size=chunk_rows, columns=FIELDS):
+			columns = batch.to_pydict()
+			yield [list(row) for row in zip(*(columns[name] for name in FIELDS))]
+		return
+	with open(in_file, 'r', encoding='utf-8') as fin:
+		fin.readline()  # header
+		while True:
+			chunk = [line.rstrip('\n').split('\t') for line in itertools.islice(fin, chunk_rows)]
+			if not chunk:
+				break
+			yield chunk
+
+# Adds the derived columns, giving one value per entry in COLUMNS
+def typed_row(row):
+	number, title, credits, description = row
+	low, high = columnar.parse_credits(credits)
+	return [number, columnar.subject_of(number), title, credits, low, high, description]
+
+# Sinks: each one is opened, given every chunk in turn, then closed, and describes its own column layout in schema()
+class CsvSink:
+	name = 'csv'
+
+	def __init__(self, path=EXPORT_FILE):
+		self.path = path
+
+	def open_file(self):
+		return open(self.path, 'w', encoding='utf-8', newline='')
+
+	def open(self):
+		self.file = self.open_file()
+		self.writer = csv.writer(self.file)
+		self.writer.writerow(FIELDS)
+
+	def write(self, chunk):
+		self.writer.writerows(chunk)
+
+	def close(self):
+		self.file.close()
+
+	def schema(self):
+		return {'format': 'csv', 'header': True, 'columns': [c for c in COLUMNS if c['name'] in FIELDS]}
+
+class GzipCsvSink(CsvSink):
+	name = 'csv.gz'
+
+	def __init__(self, path=EXPORT_FILE + '.gz'):
+		self.path = path
+
+	def open_file(self):
+		return gzip.open(self.path, 'wt', encoding='utf-8', newline='', compresslevel=6)
+
+	def schema(self):
+		return dict(super().schema(), format='csv', compression='gzip')
+
+# zstd needs the zstandard package (pip install zstandard)
+class ZstdCsvSink(CsvSink):
+	name = 'csv.zst'
+
+	def __init__(self, path=EXPORT_FILE + '.zst'):
+		self.path = path
+
+	def open_file(self):
+		import zstandard
+		raw = open(self.path, 'wb')
+		return io.TextIOWrapper(zstandard.ZstdCompressor(level=10).stream_writer(raw, closefd=True), encoding='utf-8', newline='')
+
+	def schema(self):
+		return dict(super().schema(), format='csv', compression='zstd')
+
+class JsonLinesSink:
+	name = 'jsonl'
+
+	def __init__(self, path='catalog_export.jsonl'):
+		self.path = path
 
+	def open(self):
+		self.file = open(self.path, 'w', encoding='utf-8')
+
+	def write(self, chunk):
+		names = [c['name'] for c in COLUMNS]
+		self.file.writelines(json.dumps(dict(zip(names, typed_row(row))), ensure_ascii=False) + '\n' for row in chunk)
+
+	def close(self):
+		self.file.close()
+
+	def schema(self):
+		return {'format': 'jsonl', 'columns': COLUMNS}
+
+class SqliteSink:
+	name = 'sqlite'
+	TYPES = {'string': 'TEXT', 'float': 'REAL'}
+
+	def __init__(self, path='catalog_export.sqlite', table='courses'):
+		self.path = path
+		self.table = table
+
+	def open(self):
+		if os.path.exists(self.path):
+			os.remove(self.path)
+		self.conn = sqlite3.connect(self.path)
+		columns = ', '.join(f"{c['name']} {self.TYPES[c['type']]}" for c in COLUMNS)
+		self.conn.execute(f"CREATE TABLE {self.table} ({columns})")
+		self.insert = f"INSERT INTO {self.table} VALUES ({', '.join('?' for _ in COLUMNS)})"
+
+	def write(self, chunk):
+		self.conn.executemany(self.insert, (typed_row(row) for row in chunk))
+
+	def close(self):
+		self.conn.commit()
+		self.conn.close()
+
+	def schema(self):
+		return {'format': 'sqlite', 'table': self.table,
+			'columns': [dict(c, type=self.TYPES[c['type']]) for c in COLUMNS]}
+
+# Parquet needs pyarrow; it uses the same typed layout as columnar.py, one row group per chunk
+class ParquetSink:
+	name = 'parquet'
+
+	def __init__(self, path='catalog_export.parquet'):
+		self.path = path
+
+	def open(self):
+		if columnar.pa is None:
+			raise ImportError('pyarrow is required for the parquet format')
+		self.writer = columnar.pq.ParquetWriter(self.path, columnar.SCHEMA, compression='zstd')
+
+	def write(self, chunk):
+		names = columnar.SCHEMA.names
+		columns = {name: [] for name in names}
+		for row in chunk:
+			number, subject, title, credits, low, high, description = typed_row(row)
+			for name, value in zip(names, (subject, number, title, credits, low, high, description)):
+				columns[name].append(value)
+		self.writer.write_table(columnar.pa.table(columns, schema=columnar.SCHEMA))
+
+	def close(self):
+		self.writer.close()
+
+	def schema(self):
+		return {'format': 'parquet', 'compression': 'zstd',
+			'columns': [{'name': f.name, 'type': str(f.type)} for f in columnar.SCHEMA]}
+
+SINKS = {sink.name: sink for sink in (CsvSink, JsonLinesSink, GzipCsvSink, ZstdCsvSink, SqliteSink, ParquetSink)}
+
+# One read of the input, every chunk fanned out to all the sinks; returns per-sink stats
+# Sinks whose optional library isn't installed are skipped with a message
+def export_cleaned_catalog(formats=('csv',), in_file=INPUT_FILE):
+	sinks = []
+	for name in formats:
+		sink = SINKS[name]()
+		try:
+			sink.open()
+		except ImportError as e:
+			print(f"Skipping {name}: {e}")
+			continue
+		sinks.append(sink)
+	stats = {sink.name: {'path': sink.path, 'seconds': 0.0} for sink in sinks}
+	rows = 0
+	for chunk in iter_chunks(in_file):
+		rows += len(chunk)
+		for sink in sinks:
+			start = time.perf_counter()
+			sink.write(chunk)
+			stats[sink.name]['seconds'] += time.perf_counter() - start
+	for sink in sinks:
+		start = time.perf_counter()
+		sink.close()
+		stats[sink.name]['seconds'] += time.perf_counter() - start
+		stats[sink.name]['bytes'] = os.path.getsize(sink.path)
+		stats[sink.name]['rows'] = rows
+		print(f"Exported cleaned catalog to {sink.path}")
+	# The default CSV-only run (what 09_pipeline.py schedules) writes nothing but EXPORT_FILE
+	if [sink.name for sink in sinks] != ['csv']:
+		with open(SCHEMA_FILE, 'w', encoding='utf-8') as f:
+			json.dump({sink.name: dict(sink.schema(), path=sink.path) for sink in sinks}, f, indent=2)
+	return stats
+
+def benchmark():
+	start = time.perf_counter()
+	stats = export_cleaned_catalog(list(SINKS))
+	total = time.perf_counter() - start
+	print(f"{'format':<10}{'rows/s':>12}{'seconds':>10}{'size MB':>10}")
+	for name, s in stats.items():
+		print(f"{name:<10}{s['rows'] / s['seconds']:>12,.0f}{s['seconds']:>10.3f}{s['bytes'] / 1e6:>10.2f}")
+	print(f"All formats in one pass: {total:.2f}s")
+
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser(description='Export the cleaned catalog.')
+	parser.add_argument('--formats', default='csv', help=f"comma-separated formats ({', '.join(SINKS)})")
+	parser.add_argument('--all', action='store_true', help='write every format')
+	parser.add_argument('--bench', action='store_true', help='write every format and report time and size per format')
+	args = parser.parse_args()
+	if args.bench:
+		benchmark()
+	else:
+		formats = list(SINKS) if args.all else [name.strip() for name in args.formats.split(',') if name.strip()]
+		unknown = [name for name in formats if name not in SINKS]
+		if unknown:
+			parser.error(f"unknown formats: {', '.join(unknown)}")
+		export_cleaned_catalog(formats)
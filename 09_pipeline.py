@@ -11,10 +11,34 @@
 #  results into one sequence.
 # -----------------------------------------------
 
-# Pipeline to automate sequential execution of scripts 01-08
+# Pipeline to automate execution of scripts 01-08 and the analysis scripts 10-16 (plus the catalog_search.py and search_index.py index builds)
+# Usage: python 09_pipeline.py                      (dependency-aware: only stale stages run, independent ones in parallel)
+#        python 09_pipeline.py --force 03_parse.py  (re-run a stage even if it is up to date)
+#        python 09_pipeline.py --pull               (also re-run the network stages 01, 10 and 11)
+#        python 09_pipeline.py --profile            (record per-stage time/CPU/memory/I/O to pipeline_profile.json)
+#        python 09_pipeline.py --sequential         (old behaviour: run 01-08 one after another, every time)
+#        python 09_pipeline.py --in-process         (stages 03-08 in this process, streaming records between them)
+#        python 09_pipeline.py --in-process --artifacts titles,frequencies
+#        python 09_pipeline.py --startup [--startup-baseline REV]  (import time of scripts 12-16, optionally against an older commit)
+import argparse
+import ast
+import contextlib
+import cProfile
+import csv
+import datetime
+import hashlib
+import importlib
+import json
+import resource
+import runpy
+import shutil
 import subprocess
 import sys
+import tempfile
 import os
+import time
+import tracemalloc
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 
 SCRIPTS = [
 	'01_pull.py',
@@ -27,11 +51,48 @@ SCRIPTS = [
 	'08_export.py',
 ]
 
+# Every script the dependency-aware runner knows about; each one declares INPUTS and OUTPUTS at the top
+DAG_SCRIPTS = SCRIPTS + [
+	'10_extract_1996.py',
+	'11_extract_2024.py',
+	'12_course_offerings.py',
+	'13_title_evolution.py',
+	'14_new_and_old.py',
+	'15_curriculum_breadth.py',
+	'16_compile_summary.py',
+	'catalog_search.py',
+	'search_index.py',
+]
+
+# Stages run in subprocesses never open plot windows (scripts 12 and 13 check this)
+STAGE_ENV = dict(os.environ, CATALOG_HEADLESS='1')
+
+# Analysis scripts measured by --startup, and the files they need next to them
+STARTUP_SCRIPTS = ['12_course_offerings.py', '13_title_evolution.py', '14_new_and_old.py', '15_curriculum_breadth.py', '16_compile_summary.py']
+HEAVY_MODULES = ['matplotlib', 'numpy', 'PIL']
+
+# Input fingerprints of each stage's last successful run, for the hash-match staleness check
+STATE_FILE = '.pipeline_state.json'
+
+# --profile: the run report, plus per-stage cProfile/tracemalloc dumps, go here
+PROFILE_DIR = 'profiles'
+PROFILE_REPORT = 'pipeline_profile.json'
+
+# Files the in-process mode can write, with the script that normally produces each one
+ARTIFACTS = {
+	'parsed': 'parsed_courses.tsv',  # 03_parse.py
+	'cleaned': 'cleaned_courses.tsv',  # 04_clean.py
+	'titles': 'course_titles.txt',  # 05_extract.py
+	'frequencies': 'word_frequencies.json',  # 06_frequency.py
+	'chart': 'word_frequencies_chart.html',  # 07_visualization.py
+	'export': 'catalog_export.csv',  # 08_export.py
+}
+
 # Add in indicators to show progress 
 def run_script(script):
 	print(f"Starting {script}...")
 	try:
-		result = subprocess.run([sys.executable, script], check=True, capture_output=True, text=True)
+		result = subprocess.run([sys.executable, script], check=True, capture_output=True, text=True, env=STAGE_ENV)
 		print(result.stdout)
 		print(f"{script} completed.\n")
 	except subprocess.CalledProcessError as e:
@@ -41,7 +102,372 @@ def run_script(script):
 		print(f"Pipeline stopped at {script} due to error.")
 		sys.exit(1)
 
-def main():
+# Local modules (.py files next to the script) that a script imports anywhere, including lazy imports inside
+# functions, and the local modules those import in turn, so that editing a shared module such as columnar.py or
+# tokenizer.py makes every stage using it stale
+def local_imports(script, tree=None, found=None):
+	found = set() if found is None else found
+	if tree is None:
+		with open(script, 'r', encoding='utf-8') as f:
+			tree = ast.parse(f.read(), script)
+	for node in ast.walk(tree):
+		if isinstance(node, ast.Import):
+			names = [alias.name for alias in node.names]
+		elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+			names = [node.module]
+		else:
+			continue
+		for name in names:
+			path = os.path.join(os.path.dirname(script), name.split('.')[0] + '.py')
+			if path != script and path not in found and os.path.exists(path):
+				found.add(path)
+				local_imports(path, None, found)
+	return found
+
+# Read a script's INPUTS/OUTPUTS without importing it (importing would pull in bs4/matplotlib, or even run it).
+# Module-level constants are collected as we go so declarations like INPUTS = [INPUT_FILE] resolve.
+def read_declarations(script):
+	with open(script, 'r', encoding='utf-8') as f:
+		tree = ast.parse(f.read(), script)
+	constants = {}
+	for node in tree.body:
+		if not (isinstance(node, ast.Assign) and len(node.targets) == 1 and isinstance(node.targets[0], ast.Name)):
+			continue
+		name = node.targets[0].id
+		try:
+			constants[name] = ast.literal_eval(node.value)
+		except ValueError:
+			if name in ('INPUTS', 'OUTPUTS'):
+				constants[name] = eval(compile(ast.Expression(node.value), script, 'eval'), {'__builtins__': {}, **constants})
+	return {'script': script, 'inputs': constants.get('INPUTS', []), 'outputs': constants.get('OUTPUTS', []),
+		'modules': sorted(local_imports(script, tree) - {script})}
+
+# A stage depends on every other stage that produces one of its inputs
+def build_dag(scripts):
+	stages = {script: read_declarations(script) for script in scripts if os.path.exists(script)}
+	producers = {out: script for script, stage in stages.items() for out in stage['outputs']}
+	for stage in stages.values():
+		stage['deps'] = {producers[path] for path in stage['inputs'] if path in producers and producers[path] != stage['script']}
+	return stages
+
+# Directories stand for all the files inside them
+def expand_paths(paths):
+	files = []
+	for path in paths:
+		if os.path.isdir(path):
+			files.extend(os.path.join(path, f) for f in sorted(os.listdir(path)))
+		else:
+			files.append(path)
+	return files
+
+def fingerprint(stage):
+	h = hashlib.sha256()
+	for path in expand_paths([stage['script']] + stage['modules'] + stage['inputs']):
+		h.update(path.encode('utf-8'))
+		with open(path, 'rb') as f:
+			h.update(hashlib.sha256(f.read()).digest())
+	return h.hexdigest()
+
+def load_state():
+	if not os.path.exists(STATE_FILE):
+		return {}
+	with open(STATE_FILE, 'r', encoding='utf-8') as f:
+		return json.load(f)
+
+def save_state(state):
+	with open(STATE_FILE, 'w', encoding='utf-8') as f:
+		json.dump(state, f, indent=2, sort_keys=True)
+
+# Stages with no inputs (01, 10, 11) fetch from the network: they only run when forced, or when
+# something downstream needs an output of theirs that doesn't exist yet.
+# Everything else is up to date if its outputs exist and are newer than its inputs (and the script and the local
+# modules it imports),
+# or failing that, if its inputs hash the same as on its last successful run.
+def needs_run(stage, stages, state):
+	missing = [path for path in stage['outputs'] if not os.path.exists(path)]
+	if not stage['inputs']:
+		consumed = {path for other in stages.values() for path in other['inputs']}
+		return bool(set(missing) & consumed)
+	if missing:
+		return True
+	for path in stage['inputs']:
+		if not os.path.exists(path):
+			raise FileNotFoundError(f"{stage['script']} needs {path}, which doesn't exist and no stage produces it")
+	newest_input = max(os.path.getmtime(p) for p in expand_paths([stage['script']] + stage['modules'] + stage['inputs']))
+	oldest_output = min(os.path.getmtime(p) for p in expand_paths(stage['outputs']))
+	if newest_input <= oldest_output:
+		return False
+	return state.get(stage['script']) != fingerprint(stage)
+
+# Run every stale stage, launching each as soon as the stages it depends on have finished.
+# Stages that don't depend on each other (e.g. 12-15, which only read the two MIT JSON files) run concurrently.
+def run_dag(scripts=DAG_SCRIPTS, force=(), jobs=None, dry_run=False, profile=None):
+	stages = build_dag(scripts)
+	report = {}
+	state = load_state()
+	forced = set(force)
+	pending = dict(stages)
+	done = set()
+	ran = set()
+	running = {}
+	with ThreadPoolExecutor(max_workers=jobs or os.cpu_count() or 1) as executor:
+		while pending or running:
+			for script, stage in list(pending.items()):
+				if not stage['deps'] <= done:
+					continue
+				del pending[script]
+				# A dry run can't know whether a re-run upstream stage will change its outputs, so assume it does
+				if script in forced or (dry_run and stage['deps'] & ran) or needs_run(stage, stages, state):
+					if dry_run:
+						print(f"Would run {script}")
+						ran.add(script)
+						done.add(script)
+					else:
+						running[executor.submit(run_stage, script, profile)] = script
+				else:
+					print(f"{script} is up to date. Skipping.")
+					report[script] = {'skipped': True}
+					done.add(script)
+			if not running:
+				if pending and not any(stage['deps'] <= done for stage in pending.values()):
+					raise RuntimeError(f"Dependency cycle between: {', '.join(pending)}")
+				continue
+			finished, _ = wait(running, return_when=FIRST_COMPLETED)
+			for future in finished:
+				script = running.pop(future)
+				ok, stats = future.result()
+				report[script] = stats
+				if not ok:
+					if profile is not None:
+						write_profile_report(report, profile)
+					executor.shutdown(cancel_futures=True)
+					print(f"Pipeline stopped at {script} due to error.")
+					sys.exit(1)
+				ran.add(script)
+				done.add(script)
+				if stages[script]['inputs']:
+					state[script] = fingerprint(stages[script])
+				save_state(state)
+	print(f"Pipeline completed: {len(ran)} stage(s) run, {len(stages) - len(ran)} up to date.")
+	if profile is not None:
+		write_profile_report(report, profile)
+
+# Like run_script, but returns (success, stats) instead of exiting so it can run on a worker thread
+# With profiling on, the script runs under this file's --profile-child wrapper, which measures it from the inside
+def run_stage(script, profile=None):
+	print(f"Starting {script}...")
+	cmd = [sys.executable, script]
+	if profile is not None:
+		os.makedirs(PROFILE_DIR, exist_ok=True)
+		cmd = [sys.executable, os.path.abspath(__file__), '--profile-child', script]
+		cmd += ['--cprofile'] * profile.get('cprofile', False) + ['--tracemalloc'] * profile.get('tracemalloc', False)
+	start = time.perf_counter()
+	result = subprocess.run(cmd, capture_output=True, text=True, env=STAGE_ENV)
+	stats = {'wall_s': round(time.perf_counter() - start, 3), 'returncode': result.returncode}
+	if profile is not None:
+		stats.update(read_stage_stats(script))
+	if result.returncode != 0:
+		print(f"Error running {script}:")
+		print(result.stdout)
+		print(result.stderr)
+		return False, stats
+	print(result.stdout)
+	print(f"{script} completed.\n")
+	return True, stats
+
+def stage_stats_path(script):
+	return os.path.join(PROFILE_DIR, os.path.splitext(os.path.basename(script))[0] + '.json')
+
+def read_stage_stats(script):
+	try:
+		with open(stage_stats_path(script), 'r', encoding='utf-8') as f:
+			return json.load(f)
+	except (OSError, ValueError):
+		return {}
+
+# Bytes this process has read/written; /proc/self/io is Linux-only, elsewhere fall back to block counts
+def io_counters():
+	try:
+		with open('/proc/self/io', 'r') as f:
+			fields = dict(line.split(': ') for line in f.read().splitlines())
+		return {'io_read_bytes': int(fields['rchar']), 'io_write_bytes': int(fields['wchar']),
+			'disk_read_bytes': int(fields['read_bytes']), 'disk_write_bytes': int(fields['write_bytes'])}
+	except (OSError, KeyError, ValueError):
+		usage = resource.getrusage(resource.RUSAGE_SELF)
+		return {'disk_read_bytes': usage.ru_inblock * 512, 'disk_write_bytes': usage.ru_oublock * 512}
+
+# Runs inside the stage's subprocess: executes the script as __main__ and writes its resource usage
+# (CPU includes any worker processes the stage starts; ru_maxrss is KB on Linux and bytes on macOS)
+def profile_child(script, use_cprofile=False, use_tracemalloc=False):
+	stem = os.path.splitext(os.path.basename(script))[0]
+	sys.argv = [script]
+	profiler = cProfile.Profile() if use_cprofile else None
+	if use_tracemalloc:
+		tracemalloc.start(25)
+	exit_code = 0
+	try:
+		if profiler:
+			profiler.enable()
+		runpy.run_path(script, run_name='__main__')
+	except SystemExit as e:
+		exit_code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+	finally:
+		if profiler:
+			profiler.disable()
+		stats = {}
+		if use_tracemalloc:
+			stats['py_peak_bytes'] = tracemalloc.get_traced_memory()[1]
+			top = tracemalloc.take_snapshot().statistics('lineno')[:25]
+			with open(os.path.join(PROFILE_DIR, stem + '.tracemalloc.txt'), 'w', encoding='utf-8') as f:
+				f.write('\n'.join(str(stat) for stat in top) + '\n')
+			tracemalloc.stop()
+		if profiler:
+			profiler.dump_stats(os.path.join(PROFILE_DIR, stem + '.prof'))
+		rss_scale = 1 if sys.platform == 'darwin' else 1024
+		own = resource.getrusage(resource.RUSAGE_SELF)
+		children = resource.getrusage(resource.RUSAGE_CHILDREN)
+		stats.update({
+			'cpu_user_s': round(own.ru_utime + children.ru_utime, 3),
+			'cpu_sys_s': round(own.ru_stime + children.ru_stime, 3),
+			'peak_rss_bytes': max(own.ru_maxrss, children.ru_maxrss) * rss_scale,
+		})
+		stats.update(io_counters())
+		with open(stage_stats_path(script), 'w', encoding='utf-8') as f:
+			json.dump(stats, f, indent=2)
+	sys.exit(exit_code)
+
+def write_profile_report(stages, profile):
+	path = profile.get('report', PROFILE_REPORT)
+	report = {
+		'finished_at': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+		'python': sys.version.split()[0],
+		'stages': stages,
+	}
+	with open(path, 'w', encoding='utf-8') as f:
+		json.dump(report, f, indent=2)
+	print(f"Profile report written to {path}")
+	print_profile(report)
+
+def print_profile(report):
+	print(f"{'stage':<26}{'wall s':>9}{'cpu s':>9}{'peak MB':>9}{'read MB':>9}{'write MB':>9}")
+	for script, stats in report['stages'].items():
+		if stats.get('skipped'):
+			print(f"{script:<26}{'(up to date)':>18}")
+			continue
+		cpu = stats.get('cpu_user_s', 0) + stats.get('cpu_sys_s', 0)
+		print(f"{script:<26}{stats['wall_s']:>9.2f}{cpu:>9.2f}{stats.get('peak_rss_bytes', 0) / 1e6:>9.1f}"
+			f"{stats.get('io_read_bytes', 0) / 1e6:>9.1f}{stats.get('io_write_bytes', 0) / 1e6:>9.1f}")
+
+# Per-stage change in wall time, CPU time and peak memory between two run reports
+def compare_profiles(old_path, new_path=PROFILE_REPORT):
+	with open(old_path, 'r', encoding='utf-8') as f:
+		old = json.load(f)['stages']
+	with open(new_path, 'r', encoding='utf-8') as f:
+		new = json.load(f)['stages']
+	print(f"{'stage':<26}{'wall s':>16}{'cpu s':>16}{'peak MB':>16}")
+	for script in new:
+		a, b = old.get(script, {}), new[script]
+		if not a or a.get('skipped') or b.get('skipped'):
+			continue
+		def pair(key, scale=1.0):
+			x, y = a.get(key, 0) / scale, b.get(key, 0) / scale
+			return f"{x:.2f}->{y:.2f}".rjust(16)
+		cpu_a = a.get('cpu_user_s', 0) + a.get('cpu_sys_s', 0)
+		cpu_b = b.get('cpu_user_s', 0) + b.get('cpu_sys_s', 0)
+		print(f"{script:<26}{pair('wall_s')}{f'{cpu_a:.2f}->{cpu_b:.2f}'.rjust(16)}{pair('peak_rss_bytes', 1e6)}")
+
+# The numbered scripts aren't valid identifiers, but importlib can still load them by name
+def load_stage(script):
+	return importlib.import_module(os.path.splitext(script)[0])
+
+# Passes items through unchanged while handing each one to write(), so a stage can save its artifact mid-stream
+def tap(items, write):
+	for item in items:
+		write(item)
+		yield item
+
+# Stage 03: course records straight from the HTML files (reusing the parse cache when it has the file)
+def parsed_courses(parse, backend='bs4'):
+	for fpath in parse.list_html_files():
+		key = parse.cache_key(fpath, backend)
+		records = parse.load_cached(key)
+		if records is None:
+			records = parse.parse_file_records(fpath, backend)
+			parse.store_cached(key, records)
+		for rec in records:
+			yield dict(zip(parse.FIELDS, rec))
+
+# Stage 04: clean and validate each record
+# 04_clean.py sees each record as a TSV line after line.strip().split('\t'), so the same is done here;
+# that's what drops courses with an empty description (the trailing tab gets stripped, leaving 3 fields)
+def cleaned_rows(clean, courses, fields):
+	for course in courses:
+		row = '\t'.join(course[k] for k in fields).strip().split('\t')
+		row = clean.clean_row(row)
+		if clean.is_valid_row(row):
+			yield row
+
+# Stage 05: "NUMBER: Title" lines
+def title_lines(extract, rows):
+	for row in rows:
+		line = extract.title_line(row[0], row[1])
+		if line:
+			yield line
+
+# Runs stages 03-08 as one streaming pass over the catalog, writing only the requested artifacts
+def run_in_process(artifacts=tuple(ARTIFACTS), backend='bs4'):
+	parse = load_stage('03_parse.py')
+	clean = load_stage('04_clean.py')
+	extract = load_stage('05_extract.py')
+	frequency = load_stage('06_frequency.py')
+	visualization = load_stage('07_visualization.py')
+	header = list(parse.FIELDS)
+	counts = {'parsed': 0, 'cleaned': 0, 'titles': 0}
+
+	def count(name):
+		def inc(_):
+			counts[name] += 1
+		return inc
+
+	with contextlib.ExitStack() as stack:
+		def open_artifact(name, **kwargs):
+			return stack.enter_context(open(ARTIFACTS[name], 'w', encoding='utf-8', **kwargs))
+
+		courses = tap(parsed_courses(parse, backend), count('parsed'))
+		if 'parsed' in artifacts:
+			parsed_f = open_artifact('parsed')
+			parsed_f.write('\t'.join(header) + '\n')
+			courses = tap(courses, lambda c: parsed_f.write('\t'.join(c[k] for k in header) + '\n'))
+		rows = tap(cleaned_rows(clean, courses, header), count('cleaned'))
+		if 'cleaned' in artifacts:
+			cleaned_f = open_artifact('cleaned')
+			cleaned_f.write('\t'.join(header) + '\n')
+			rows = tap(rows, lambda row: cleaned_f.write('\t'.join(row) + '\n'))
+		if 'export' in artifacts:
+			writer = csv.writer(open_artifact('export', newline=''))
+			writer.writerow(header)
+			rows = tap(rows, writer.writerow)
+		titles = tap(title_lines(extract, rows), count('titles'))
+		if 'titles' in artifacts:
+			titles_f = open_artifact('titles')
+			titles = tap(titles, lambda t: titles_f.write(t + '\n'))
+		if 'frequencies' in artifacts or 'chart' in artifacts:
+			word_counts = frequency.reduce_word_counts(frequency.map_words(titles))
+		else:
+			for _ in titles:
+				pass
+
+	print(f"Parsed {counts['parsed']} courses, {counts['cleaned']} valid after cleaning, {counts['titles']} titles.")
+	if 'frequencies' in artifacts:
+		with open(ARTIFACTS['frequencies'], 'w', encoding='utf-8') as f:
+			json.dump(dict(word_counts), f, ensure_ascii=False, indent=2)
+	if 'chart' in artifacts:
+		top_words = sorted(word_counts.items(), key=lambda x: x[1], reverse=True)[:20]
+		visualization.generate_google_bar_chart_html(top_words, ARTIFACTS['chart'])
+	for name in artifacts:
+		print(f"Wrote {ARTIFACTS[name]}")
+
+def run_sequential():
 	for script in SCRIPTS:
 		if not os.path.exists(script):
 			print(f"Script {script} not found. Skipping.")
@@ -49,7 +475,102 @@ def main():
 		run_script(script)
 	print("Pipeline completed successfully. All outputs generated.")
 
-if __name__ == '__main__':
-	main()
+# Imports `module` in a fresh interpreter under -X importtime. Returns the wall time and, per module, its
+# cumulative import time in seconds (for a module imported at several depths, the largest, i.e. outermost, one)
+def import_profile(module, cwd, pythonpath):
+	env = dict(STAGE_ENV, PYTHONPATH=os.pathsep.join(pythonpath), MPLBACKEND='Agg')
+	# __import__ rather than importlib.import_module, whose top-level import -X importtime doesn't report
+	code = f"__import__({module!r})"
+	start = time.perf_counter()
+	result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=cwd, env=env, capture_output=True, text=True)
+	wall = time.perf_counter() - start
+	if result.returncode != 0:
+		raise RuntimeError(f"importing {module} failed:\n{result.stderr[-2000:]}")
+	# Lines look like "import time:   self [us] | cumulative | name", with nested imports indented under their parent
+	cumulative = {}
+	for line in result.stderr.splitlines():
+		if not line.startswith('import time:') or line.endswith('| imported package'):
+			continue
+		_, total, name = line[len('import time:'):].split('|')
+		name = name.strip()
+		cumulative[name] = max(cumulative.get(name, 0), int(total) / 1e6)
+	return wall, cumulative
+
+# Startup cost of each analysis script: a fresh interpreter importing it (which, for a script that does its
+# work at module level, means running it). With a baseline commit the old versions are measured the same way.
+# Runs in a scratch copy of the data files so nothing in the working tree is overwritten.
+def startup_benchmark(scripts=STARTUP_SCRIPTS, baseline=None, repeat=3):
+	root = os.path.dirname(os.path.abspath(__file__))
+	versions = [('now', None)] + ([(baseline, baseline)] if baseline else [])
+	with tempfile.TemporaryDirectory() as scratch:
+		for name in os.listdir(root):
+			if name.endswith(('.json', '.png')):
+				shutil.copy2(os.path.join(root, name), scratch)
+		code_dirs = {}
+		for label, rev in versions:
+			if rev is None:
+				code_dirs[label] = [root]
+				continue
+			old_dir = os.path.join(scratch, 'baseline')
+			os.makedirs(old_dir, exist_ok=True)
+			for script in scripts:
+				source = subprocess.run(['git', 'show', f'{rev}:{script}'], cwd=root, capture_output=True, text=True, check=True).stdout
+				with open(os.path.join(old_dir, script), 'w', encoding='utf-8') as f:
+					f.write(source)
+			code_dirs[label] = [old_dir, root]
+		print(f"{'script':<26}{'version':<10}{'wall ms':>9}{'import ms':>11}  heavy modules loaded")
+		for script in scripts:
+			module = os.path.splitext(script)[0]
+			for label, _ in versions:
+				import_profile(module, scratch, code_dirs[label])  # warm-up (also builds caches such as the MIT snapshots)
+				runs = [import_profile(module, scratch, code_dirs[label]) for _ in range(repeat)]
+				wall, cumulative = min(runs, key=lambda run: run[0])
+				heavy = []
+				for package in HEAVY_MODULES:
+					times = [t for name, t in cumulative.items() if name.split('.')[0] == package]
+					if times:
+						heavy.append(f"{package} {max(times) * 1000:.0f}ms")
+				print(f"{script:<26}{label:<10}{wall * 1000:>9.0f}{cumulative.get(module, 0) * 1000:>11.1f}  {', '.join(heavy) or '-'}")
 
+def main(force=(), jobs=None, dry_run=False, profile=None):
+	run_dag(DAG_SCRIPTS, force, jobs, dry_run, profile)
 
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser(description='Run the catalog pipeline.')
+	parser.add_argument('--in-process', action='store_true', help='run stages 03-08 in this process without intermediate files')
+	parser.add_argument('--artifacts', default=','.join(ARTIFACTS), help=f"comma-separated outputs to write in --in-process mode ({', '.join(ARTIFACTS)})")
+	parser.add_argument('--backend', default='bs4', help='HTML parser backend for --in-process mode (see 03_parse.py)')
+	parser.add_argument('--sequential', action='store_true', help='run scripts 01-08 one after another, without staleness checks')
+	parser.add_argument('--force', nargs='*', default=[], metavar='SCRIPT', help='re-run these stages even if up to date (stages downstream re-run if their inputs changed)')
+	parser.add_argument('--pull', action='store_true', help='re-run the network stages (01, 10, 11)')
+	parser.add_argument('--jobs', type=int, default=None, help='max stages to run at once (default: number of CPUs)')
+	parser.add_argument('--dry-run', action='store_true', help='only print which stages would run')
+	parser.add_argument('--profile', action='store_true', help=f'record wall/CPU time, peak RSS and I/O per stage in {PROFILE_REPORT}')
+	parser.add_argument('--cprofile', action='store_true', help=f'with --profile, also save a cProfile dump per stage in {PROFILE_DIR}/')
+	parser.add_argument('--tracemalloc', action='store_true', help=f'with --profile, also save a tracemalloc snapshot per stage in {PROFILE_DIR}/')
+	parser.add_argument('--profile-report', default=PROFILE_REPORT, help='where --profile writes its JSON run report')
+	parser.add_argument('--compare', metavar='OLD_REPORT', help='compare a saved run report against --profile-report and exit')
+	parser.add_argument('--startup', action='store_true', help='measure the import/startup time of the analysis scripts 12-16 and exit')
+	parser.add_argument('--startup-baseline', metavar='REV', help='with --startup, also measure the scripts as of this git revision')
+	parser.add_argument('--profile-child', metavar='SCRIPT', help=argparse.SUPPRESS)
+	args = parser.parse_args()
+	if args.startup:
+		startup_benchmark(baseline=args.startup_baseline)
+	elif args.profile_child:
+		profile_child(args.profile_child, args.cprofile, args.tracemalloc)
+	elif args.compare:
+		compare_profiles(args.compare, args.profile_report)
+	elif args.sequential:
+		run_sequential()
+	elif args.in_process:
+		artifacts = [name.strip() for name in args.artifacts.split(',') if name.strip()]
+		unknown = [name for name in artifacts if name not in ARTIFACTS]
+		if unknown:
+			parser.error(f"unknown artifacts: {', '.join(unknown)}")
+		run_in_process(artifacts, args.backend)
+	else:
+		force = list(args.force)
+		if args.pull:
+			force += ['01_pull.py', '10_extract_1996.py', '11_extract_2024.py']
+		profile = {'cprofile': args.cprofile, 'tracemalloc': args.tracemalloc, 'report': args.profile_report} if args.profile else None
+		main(force, args.jobs, args.dry_run, profile)
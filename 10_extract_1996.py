@@ -1,18 +1,47 @@
 # Extract course numbers and titles from 1996 PDF catalogs (Parts 1-8)
-# Usage: python 10_extract_1996.py
+# Usage: python 10_extract_1996.py [start_part] [--workers N] [--tesseract-threads N] [--window N] [--no-cache] [--refresh-pdfs]
 # Output: 10_extract_1996.json
+# Downloaded PDFs are kept in pdf_cache/, and the raw OCR text of every page in ocr_cache/, keyed by the PDF's
+# sha256, the page number, the DPI and the tesseract settings. A re-run (e.g. after changing the regexes in
+# extract_courses_from_text) reads the text back instead of downloading and OCRing again, and a run that was
+# interrupted picks up at the first page that wasn't OCRed yet.
+# Not measured yet: how long such a re-run takes over all eight real parts (the 'from OCR cache' line of --bench is
+# the same run on one PDF).
+# Pages are rendered a few at a time (--window) on a background thread while earlier pages are OCRed,
+# so memory stays bounded by the window size rather than the size of the part.
+# Not measured yet: peak memory and scratch space per window on a real catalog part (--bench prints the peak number
+# and size of rendered pages); the bound has only been checked on the rendered sample PDF.
+# Pages are OCRed in parallel by a pool of worker processes; each page's tesseract is limited to
+# --tesseract-threads threads (default: CPUs / workers) so the workers don't oversubscribe the cores.
+# Results are collected in page order, so the course list is the same as a one-page-at-a-time run.
+# Not measured yet: the pool's speedup on a real catalog part (run --bench --bench-pdf pdf_cache/0N.pdf); so far the
+# pool has only been timed on the rendered sample PDF.
+# Offline benchmarks on locally rendered sample PDFs: python 10_extract_1996.py --bench | --bench-layout [--bench-pdf FILE]
+# The region-of-interest OCR modes (see OCR_MODES) are only used by --bench-layout for now: they have been checked on
+# rendered sample pages but not yet against full-page OCR on a real catalog part. Once
+# --bench-layout --bench-pdf pdf_cache/0N.pdf shows they do at least as well, add an --ocr-mode option for main's mode.
 
 # Note: you must install pdfminer, pillow, pdf2image, poppler, tesseract, and pytesseract to run this script 
 
 
-import requests
+import hashlib
+import http_client
 import re
 import json
 import io
-from pdf2image import convert_from_bytes
-from PIL import Image
+import argparse
+import os
+import queue
+import tempfile
+import threading
+import time
+from array import array
+from collections import deque
+from urllib.parse import urlsplit
+from concurrent.futures import ProcessPoolExecutor
+from pdf2image import convert_from_path, pdfinfo_from_path
+from PIL import Image, ImageFilter
 import pytesseract
-import sys
 
 PDF_URLS = [
 	'https://onexi.org/catalog/pdf/01.pdf',
@@ -26,12 +55,61 @@ PDF_URLS = [
 ]
 OUTPUT_FILE = '10_extract_1996.json'
 
+# Files this script reads and writes (used by 09_pipeline.py to schedule it)
+INPUTS = []
+OUTPUTS = [OUTPUT_FILE]
+
+# OCR worker processes (pages are independent, so they're sharded across the pool)
+OCR_WORKERS = os.cpu_count() or 1
+# Pages rasterized per pdftoppm call; memory and scratch disk use scale with this, not with the part's page count
+RENDER_WINDOW = 4
+# Rendering resolution and tesseract settings (all part of the OCR cache key)
+OCR_DPI = 200
+TESSERACT_LANG = 'eng'
+TESSERACT_CONFIG = ''
+# Region-of-interest OCR (the mode argument of main and ocr_part): 'page' OCRs the whole page with tesseract's own page segmentation.
+# 'columns' first runs a cheap layout pass (projection profiles of a downscaled, binarized page) that finds the gutter
+# between the two text columns and the headings that cross it, and OCRs those regions stacked in reading order as a
+# single column, so text from the two columns is never joined into one line. 'headers' also keeps only the first
+# HEADER_LINES lines of each course entry, so the descriptions extract_courses_from_text throws away aren't OCRed.
+OCR_MODES = ('page', 'columns', 'headers')
+LAYOUT_SCALE = 2        # the layout pass works at 1/2 resolution
+INK_LEVEL = 128         # gray levels below this count as ink
+GUTTER_MIN_WIDTH = 30   # px; narrower blank strips are gaps between words
+GUTTER_MAX_INK = 0.03   # share of ink a gutter may have (headings that cross it)
+LINE_MIN_INK = 0.02     # a text line has a row with at least this share of ink; scan noise left after despeckling doesn't
+BAND_MIN_INK = 0.1      # likewise for a heading, measured in the middle third of the gutter
+MIN_LINE_HEIGHT = 8     # px; thinner runs of inked rows are rules or specks, not text
+MIN_BAND_HEIGHT = 12    # px; thinner runs of ink across the gutter are specks, not headings
+ENTRY_GAP_FACTOR = 1.6  # a gap this many times a column's median line gap starts a new course entry
+HEADER_LINES = 3        # a course number and title rarely take more lines than this
+REGION_GAP = 40         # px of white between stacked regions
+REGION_PAD = 8          # px of margin kept around each region
+# Part of the OCR cache key of the layout modes; bump it whenever layout_regions or region_sheet change what they return
+LAYOUT_VERSION = 2
+# Downloaded catalog parts, and the raw OCR text of every page
+PDF_CACHE_DIR = 'pdf_cache'
+OCR_CACHE_DIR = 'ocr_cache'
+
 def download_pdf(url):
 	print(f"Downloading {url}...")
-	resp = requests.get(url)
+	resp = http_client.get(url)
 	resp.raise_for_status()
 	return resp.content
 
+# Local path of a catalog part, downloading it into pdf_cache/ only the first time (or with refresh)
+def fetch_pdf(url, cache_dir=PDF_CACHE_DIR, refresh=False):
+	path = os.path.join(cache_dir, os.path.basename(urlsplit(url).path))
+	if os.path.exists(path) and not refresh:
+		print(f"Using cached {path}")
+		return path
+	pdf_bytes = download_pdf(url)
+	os.makedirs(cache_dir, exist_ok=True)
+	with open(path + '.tmp', 'wb') as f:
+		f.write(pdf_bytes)
+	os.replace(path + '.tmp', path)
+	return path
+
 def extract_courses_from_text(text):
 	# Extract course number and title pairs, skip prerequisites
 	courses = []
@@ -69,7 +147,272 @@ def extract_courses_from_text(text):
 			i += 1
 	return courses
 
-def main(start_part=1):
+# Tesseract reads OMP_THREAD_LIMIT when it starts, and every pytesseract call starts a new tesseract
+# process from this one's environment, so setting it once per worker limits all of that worker's pages
+def limit_tesseract_threads(threads):
+	if threads:
+		os.environ['OMP_THREAD_LIMIT'] = str(threads)
+
+# Split the cores between the workers: one worker may use them all, a full pool gets one thread each
+def default_tesseract_threads(workers):
+	return max(1, (os.cpu_count() or 1) // workers)
+
+# Runs in a worker: OCR one rendered page and return its raw text
+def ocr_page(image_path, mode='page'):
+	with Image.open(image_path) as image:
+		sheet = region_sheet(image, mode) if mode != 'page' else None
+		if sheet is None:
+			return pytesseract.image_to_string(image, lang=TESSERACT_LANG, config=TESSERACT_CONFIG)
+		return pytesseract.image_to_string(sheet, lang=TESSERACT_LANG, config=f"{TESSERACT_CONFIG} --psm 4".strip())
+
+# [(start, end)] of the runs of consecutive values that satisfy keep
+def runs(values, keep):
+	spans = []
+	start = None
+	for i, value in enumerate(values):
+		if keep(value):
+			if start is None:
+				start = i
+		elif start is not None:
+			spans.append((start, i))
+			start = None
+	if start is not None:
+		spans.append((start, len(values)))
+	return spans
+
+# Ink share of every pixel column (axis 0) or row (axis 1) of box, from 0 to 1
+def ink_profile(ink, box, axis):
+	left, top, right, bottom = box
+	size = (right - left, 1) if axis == 0 else (1, bottom - top)
+	# Averaged in float mode: in 8-bit mode one dot of ink in a wide row would round down to nothing
+	return [v / 255 for v in array('f', ink.crop(box).convert('F').resize(size, Image.BOX).tobytes())]
+
+# Runs of rows with any ink that look like text rather than noise: at least min_height px tall, and with at least
+# min_ink of ink in some row. A whole run is kept, so faint rows at the top and bottom of a line stay part of it.
+def ink_runs(profile, min_ink, min_height):
+	return [(start, end) for start, end in runs(profile, lambda v: v > 0)
+		if (end - start) * LAYOUT_SCALE >= min_height and max(profile[start:end]) >= min_ink]
+
+# The widest run of (nearly) blank pixel columns in the middle half of the text area, or None for a one-column page
+def find_gutter(ink, box):
+	left, _, right, _ = box
+	width = right - left
+	gaps = [(end - start, start, end) for start, end in runs(ink_profile(ink, box, 0), lambda v: v <= GUTTER_MAX_INK)
+		if start > width // 4 and end < width * 3 // 4 and (end - start) * LAYOUT_SCALE >= GUTTER_MIN_WIDTH]
+	if not gaps:
+		return None
+	_, start, end = max(gaps)
+	return left + start, left + end
+
+# (top, bottom) of each text line in box
+def text_lines(ink, box):
+	top = box[1]
+	return [(top + start, top + end) for start, end in ink_runs(ink_profile(ink, box, 1), LINE_MIN_INK, MIN_LINE_HEIGHT)]
+
+# A column cut down to the first HEADER_LINES text lines of each course entry. Entries are told apart by the gap
+# before them, which is wider than the usual gap between the lines of one entry.
+def entry_headers(ink, box, lines):
+	left, _, right, _ = box
+	if len(lines) < 2:
+		return [box]
+	gaps = sorted(b[0] - a[1] for a, b in zip(lines, lines[1:]))
+	threshold = gaps[len(gaps) // 2] * ENTRY_GAP_FACTOR
+	entries = [[lines[0]]]
+	for previous, line in zip(lines, lines[1:]):
+		if line[0] - previous[1] > threshold:
+			entries.append([])
+		entries[-1].append(line)
+	return [(left, entry[0][0], right, entry[:HEADER_LINES][-1][1]) for entry in entries]
+
+# Layout pass on a binarized copy of the page at 1/LAYOUT_SCALE resolution: the regions worth OCRing, in reading
+# order, as full-resolution boxes. The text area is split down the middle of the gutter between the two columns,
+# except for bands of text lines that cross it (department and subject headings), which are regions of their own;
+# each band closes a section, whose left column is read before its right one. None if the page has no gutter.
+def layout_regions(image, mode):
+	gray = image.convert('L')
+	small = gray.resize((gray.width // LAYOUT_SCALE, gray.height // LAYOUT_SCALE), Image.BOX)
+	# A 3x3 median drops isolated specks of scan noise but keeps text strokes, which are at least 2 px wide here
+	ink = small.point(lambda v: 255 if v < INK_LEVEL else 0).filter(ImageFilter.MedianFilter(3))
+	area = ink.getbbox()
+	if area is None:
+		return None
+	gutter = find_gutter(ink, area)
+	if gutter is None:
+		return None
+	left, top, right, bottom = area
+	# Only ink in the middle third of the gutter counts as crossing it; a long line may stray into its edges
+	third = (gutter[1] - gutter[0]) // 3
+	split = (gutter[0] + gutter[1]) // 2
+	inked = [v > 0 for v in ink_profile(ink, area, 1)]
+	bands = []
+	for start, end in ink_runs(ink_profile(ink, (gutter[0] + third, top, gutter[1] - third, bottom), 1), BAND_MIN_INK, MIN_BAND_HEIGHT):
+		# Widen to the whole text lines the crossing ink belongs to
+		while start > 0 and inked[start - 1]:
+			start -= 1
+		while end < len(inked) and inked[end]:
+			end += 1
+		if bands and start <= bands[-1][1]:
+			bands[-1] = (bands[-1][0], max(end, bands[-1][1]))
+		else:
+			bands.append((start, end))
+	bands = [(top + start, top + end) for start, end in bands]
+	regions = []
+	y = top
+	for band_top, band_bottom in bands + [(bottom, bottom)]:
+		if band_top > y:
+			for x0, x1 in ((left, split), (split, right)):
+				inner = ink.crop((x0, y, x1, band_top)).getbbox()
+				if inner is None:
+					continue
+				# Trimmed to its text lines, so leftover specks above or below don't make a region of their own
+				lines = text_lines(ink, (x0 + inner[0], y, x0 + inner[2], band_top))
+				if not lines:
+					continue
+				column = (x0 + inner[0], lines[0][0], x0 + inner[2], lines[-1][1])
+				regions += entry_headers(ink, column, lines) if mode == 'headers' else [column]
+		if band_bottom > band_top:
+			regions.append((left, band_top, right, band_bottom))
+		y = band_bottom
+	return [tuple(v * LAYOUT_SCALE for v in region) for region in regions]
+
+# The page's regions pasted one under the other (REGION_GAP apart) onto a white sheet one column wide, so tesseract
+# reads them in order as a single column. None when the page has no two-column layout to split.
+def region_sheet(image, mode):
+	regions = layout_regions(image, mode)
+	if regions is None:
+		return None
+	crops = [image.crop((max(0, l - REGION_PAD), max(0, t - REGION_PAD), min(image.width, r + REGION_PAD), min(image.height, b + REGION_PAD)))
+		for l, t, r, b in regions]
+	sheet = Image.new(image.mode, (max(c.width for c in crops), sum(c.height + REGION_GAP for c in crops)), 'white')
+	y = 0
+	for crop in crops:
+		sheet.paste(crop, (0, y))
+		y += crop.height + REGION_GAP
+	return sheet
+
+# Everything besides the page image that decides what tesseract returns; part of every OCR cache key
+def ocr_settings(mode='page'):
+	settings = f"dpi={OCR_DPI}:lang={TESSERACT_LANG}:config={TESSERACT_CONFIG}"
+	if mode == 'page':
+		return settings
+	layout = (LAYOUT_VERSION, LAYOUT_SCALE, INK_LEVEL, GUTTER_MIN_WIDTH, GUTTER_MAX_INK, LINE_MIN_INK, BAND_MIN_INK,
+		MIN_LINE_HEIGHT, MIN_BAND_HEIGHT, REGION_GAP, REGION_PAD)
+	if mode == 'headers':
+		layout += (ENTRY_GAP_FACTOR, HEADER_LINES)
+	return f"{settings}:mode={mode}:layout={layout}"
+
+def pdf_digest(pdf_path):
+	h = hashlib.sha256()
+	with open(pdf_path, 'rb') as f:
+		for block in iter(lambda: f.read(1 << 20), b''):
+			h.update(block)
+	return h.hexdigest()
+
+# One text file per page: ocr_cache/<sha256 of the PDF>/<hash of the OCR settings>/<page>.txt
+def ocr_cache_dir(pdf_path, cache_dir=OCR_CACHE_DIR, mode='page'):
+	settings = hashlib.sha256(ocr_settings(mode).encode('utf-8')).hexdigest()[:16]
+	return os.path.join(cache_dir, pdf_digest(pdf_path), settings)
+
+def ocr_cache_path(page_dir, page_num):
+	return os.path.join(page_dir, f"{page_num:04d}.txt")
+
+# Returns the cached text of this page, or None on a miss
+def load_cached_text(page_dir, page_num):
+	try:
+		with open(ocr_cache_path(page_dir, page_num), 'r', encoding='utf-8') as f:
+			return f.read()
+	except OSError:
+		return None
+
+def store_cached_text(page_dir, page_num, text):
+	os.makedirs(page_dir, exist_ok=True)
+	tmp = ocr_cache_path(page_dir, page_num) + '.tmp'
+	with open(tmp, 'w', encoding='utf-8') as f:
+		f.write(text)
+	os.replace(tmp, ocr_cache_path(page_dir, page_num))
+
+# Renders the given pages window by window (first_page/last_page over runs of at most `window` consecutive pages),
+# and hands each page's image file to the OCR side through a queue that holds at most `window` pages.
+# Runs on its own thread: pdftoppm is a separate process, so rendering the next window overlaps OCR of the last one.
+def render_pages(pdf_path, page_nums, out_dir, window, pages):
+	try:
+		runs = []
+		for page_num in page_nums:
+			if runs and page_num == runs[-1][-1] + 1 and len(runs[-1]) < window:
+				runs[-1].append(page_num)
+			else:
+				runs.append([page_num])
+		for run in runs:
+			paths = convert_from_path(pdf_path, dpi=OCR_DPI, first_page=run[0], last_page=run[-1], output_folder=out_dir, paths_only=True)
+			for page_num, path in zip(run, paths):
+				pages.put((page_num, path))
+	except Exception as e:
+		pages.put(e)
+	pages.put(None)
+
+# Pages of one part as a list of per-page course lists, in page order.
+# Pages whose text is in the OCR cache (cache_dir, None to bypass it) aren't rendered or OCRed again; the rest are
+# OCRed and cached one by one as they finish, so an interrupted run resumes from the last finished page.
+# Rendered pages go to image files in out_dir, so workers get a path rather than a pickled image, nothing holds a
+# whole part in memory, and each file is deleted once its page is done. At any time at most about
+# 2 * window + 2 * workers pages exist: one window being rendered, one queued, and the pages being OCRed.
+def ocr_part(pdf_path, part, out_dir, executor=None, workers=1, window=RENDER_WINDOW, cache_dir=OCR_CACHE_DIR, mode='page'):
+	page_count = pdfinfo_from_path(pdf_path)['Pages']
+	page_dir = ocr_cache_dir(pdf_path, cache_dir, mode) if cache_dir else None
+	cached = {}
+	for page_num in range(1, page_count + 1):
+		# Skip pages 1, 2, 3 of part 1 (not course data)
+		if part == 1 and page_num in (1, 2, 3):
+			print(f"  Skipping page {page_num} of part 1 (not course data)")
+			continue
+		cached[page_num] = load_cached_text(page_dir, page_num) if page_dir else None
+	missing = [page_num for page_num, text in cached.items() if text is None]
+	print(f"Performing OCR on {len(missing)} of {page_count} pages from part {part} ({len(cached) - len(missing)} cached)...")
+	pages = queue.Queue(maxsize=window)
+	renderer = threading.Thread(target=render_pages, args=(pdf_path, missing, out_dir, window, pages), daemon=True)
+	renderer.start()
+	# Without a pool each page is OCRed as soon as it arrives; with one, up to 2 pages per worker are in flight
+	# and results are collected oldest first, which keeps page order whichever worker finishes first
+	in_flight = deque()
+	limit = 2 * workers if executor else 0
+	courses_by_page = []
+	def collect():
+		page_num, path, result = in_flight.popleft()
+		if path is None:
+			text = result
+		else:
+			text = result.result() if executor else result
+			os.remove(path)
+			if page_dir:
+				store_cached_text(page_dir, page_num, text)
+		courses = extract_courses_from_text(text)
+		print(f"  Page {page_num}: {len(courses)} courses found{' (cached)' if path is None else ''}.")
+		courses_by_page.append(courses)
+	for page_num, text in cached.items():
+		if text is not None:
+			in_flight.append((page_num, None, text))
+		else:
+			item = pages.get()
+			if isinstance(item, Exception):
+				raise item
+			rendered_num, path = item
+			assert rendered_num == page_num, f"rendered page {rendered_num}, expected {page_num}"
+			in_flight.append((page_num, path, executor.submit(ocr_page, path, mode) if executor else ocr_page(path, mode)))
+		while len(in_flight) > limit:
+			collect()
+	while in_flight:
+		collect()
+	renderer.join()
+	return courses_by_page
+
+def make_pool(workers, threads=None):
+	if workers <= 1:
+		limit_tesseract_threads(threads)
+		return None
+	return ProcessPoolExecutor(max_workers=workers, initializer=limit_tesseract_threads,
+		initargs=(threads or default_tesseract_threads(workers),))
+
+def main(start_part=1, workers=OCR_WORKERS, threads=None, window=RENDER_WINDOW, use_cache=True, refresh_pdfs=False, mode='page'):
 	# If output file exists and resuming, load previous results
 	all_courses = []
 	if start_part > 1:
@@ -79,37 +422,207 @@ def main(start_part=1):
 			print(f"Loaded {len(all_courses)} courses from previous run.")
 		except Exception:
 			print("No previous output found or failed to load, starting fresh from part", start_part)
-	for idx, url in enumerate(PDF_URLS, 1):
-		if idx < start_part:
-			continue
-		pdf_bytes = download_pdf(url)
-		print(f"Converting PDF part {idx} to images...")
-		images = convert_from_bytes(pdf_bytes)
-		print(f"Performing OCR on {len(images)} pages from part {idx}...")
-		for page_num, image in enumerate(images, 1):
-			# Skip pages 1, 2, 3 of part 1 (not course data)
-			if idx == 1 and page_num in (1, 2, 3):
-				print(f"  Skipping page {page_num} of part 1 (not course data)")
+	executor = make_pool(workers, threads)
+	try:
+		for idx, url in enumerate(PDF_URLS, 1):
+			if idx < start_part:
 				continue
-			text = pytesseract.image_to_string(image)
-			courses = extract_courses_from_text(text)
-			print(f"  Page {page_num}: {len(courses)} courses found.")
-			all_courses.extend(courses)
-		# Save progress after each part
-		with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
-			json.dump(all_courses, f, ensure_ascii=False, indent=2)
-		print(f"Saved progress: {len(all_courses)} courses to {OUTPUT_FILE}")
+			pdf_path = fetch_pdf(url, refresh=refresh_pdfs)
+			print(f"Converting PDF part {idx} to images...")
+			with tempfile.TemporaryDirectory() as out_dir:
+				for courses in ocr_part(pdf_path, idx, out_dir, executor, workers, window, OCR_CACHE_DIR if use_cache else None, mode):
+					all_courses.extend(courses)
+			# Save progress after each part
+			with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
+				json.dump(all_courses, f, ensure_ascii=False, indent=2)
+			print(f"Saved progress: {len(all_courses)} courses to {OUTPUT_FILE}")
+	finally:
+		if executor:
+			executor.shutdown()
 	print(f"Finished. Total courses: {len(all_courses)} saved to {OUTPUT_FILE}")
+	http_client.get_client().print_stats()
+
+def sample_font(size):
+	from PIL import ImageFont
+	try:
+		return ImageFont.truetype('DejaVuSans.ttf', size)
+	except OSError:
+		return ImageFont.load_default(size=size)
+
+# A stand-in for a catalog part: pages of real course numbers and titles (from the MIT 1996 list)
+# drawn as plain text and saved as a multi-page PDF, so OCR can be benchmarked without downloading anything
+def make_sample_pdf(path, pages=8, lines_per_page=40, source='10_mit_1996.json'):
+	from PIL import ImageDraw
+	with open(source, 'r', encoding='utf-8') as f:
+		courses = [c for c in json.load(f) if len(c['title']) < 70]
+	font = sample_font(28)
+	images = []
+	for page in range(pages):
+		image = Image.new('RGB', (1700, 2200), 'white')
+		draw = ImageDraw.Draw(image)
+		for line in range(lines_per_page):
+			course = courses[(page * lines_per_page + line) % len(courses)]
+			draw.text((120, 120 + line * 50), f"{course['number']} {course['title']}", fill='black', font=font)
+		images.append(image)
+	images[0].save(path, save_all=True, append_images=images[1:], resolution=200)
+	return path
+
+# Closer to a real 1996 page: a heading across the top, then two columns of entries, each a course number and title,
+# a prerequisite line and a few lines of description. Returns the page images and the courses drawn, in reading order.
+def two_column_pages(pages=8, entries_per_column=9, source='10_mit_1996.json'):
+	from PIL import ImageDraw
+	with open(source, 'r', encoding='utf-8') as f:
+		courses = [c for c in json.load(f) if len(c['title']) < 36 and re.fullmatch(r"[A-Za-z .,:&'()/-]+", c['title'])]
+	heading, text = sample_font(36), sample_font(24)
+	filler = [word for c in courses for word in c['title'].lower().split() if word.isalpha()]
+	images = []
+	expected = []
+	for page in range(pages):
+		image = Image.new('RGB', (1700, 2200), 'white')
+		draw = ImageDraw.Draw(image)
+		draw.text((520, 110), f"Subjects, part {page + 1} (continued)", fill='black', font=heading)
+		for column, x in enumerate((110, 900)):
+			y = 220
+			for entry in range(entries_per_column):
+				n = (page * 2 + column) * entries_per_column + entry
+				course = courses[n % len(courses)]
+				expected.append({'number': course['number'], 'title': course['title']})
+				draw.text((x, y), f"{course['number']} {course['title']}", fill='black', font=text)
+				draw.text((x, y + 34), "Prereq: Permission of instructor", fill='black', font=text)
+				for line in range(3):
+					words = filler[(n * 21 + line * 5) % (len(filler) - 8):][:8]
+					while draw.textlength(' '.join(words), font=text) > 640:
+						words.pop()
+					draw.text((x, y + 68 + line * 34), ' '.join(words), fill='black', font=text)
+				y += 210
+		images.append(image)
+	return images, expected
+
+# two_column_pages saved as a multi-page PDF; returns its path and the courses drawn
+def make_two_column_sample(path, pages=8, entries_per_column=9, source='10_mit_1996.json'):
+	images, expected = two_column_pages(pages, entries_per_column, source)
+	images[0].save(path, save_all=True, append_images=images[1:], resolution=200)
+	return path, expected
+
+# Polls out_dir while a part is OCRed and records the most rendered page images (and bytes) that existed at once
+class ScratchMonitor(threading.Thread):
+	def __init__(self, out_dir, interval=0.05):
+		super().__init__(daemon=True)
+		self.out_dir = out_dir
+		self.interval = interval
+		self.peak_pages = 0
+		self.peak_bytes = 0
+		self.done = threading.Event()
+
+	def run(self):
+		while not self.done.wait(self.interval):
+			sizes = []
+			for entry in os.scandir(self.out_dir):
+				if not entry.name.endswith('.pdf'):
+					try:
+						sizes.append(entry.stat().st_size)
+					except FileNotFoundError:
+						pass
+			self.peak_pages = max(self.peak_pages, len(sizes))
+			self.peak_bytes = max(self.peak_bytes, sum(sizes))
+
+# Rendering the whole part up front (the old behaviour) against windowed rendering, sequentially and with the worker
+# pool, on the same PDF (treated as a part other than 1, so no pages are skipped)
+def benchmark(pdf_path=None, workers=OCR_WORKERS, threads=None, window=RENDER_WINDOW):
+	with tempfile.TemporaryDirectory() as tmp:
+		if pdf_path is None:
+			pdf_path = make_sample_pdf(os.path.join(tmp, 'sample.pdf'))
+		page_count = pdfinfo_from_path(pdf_path)['Pages']
+		cache_dir = os.path.join(tmp, 'ocr_cache')
+		timings = {}
+		results = {}
+		scratch = {}
+		# The OCR cache is bypassed except for the last two runs: the first fills it, the second (what a re-run
+		# after editing extract_courses_from_text costs) reads every page's text back from it
+		runs = (('whole part, sequential', 1, page_count, None), ('sequential', 1, window, None),
+			(f"{workers} workers", workers, window, None), ('filling OCR cache', workers, window, cache_dir),
+			('from OCR cache', workers, window, cache_dir))
+		for label, n, w, cache in runs:
+			executor = make_pool(n, threads if n > 1 else None)
+			try:
+				with tempfile.TemporaryDirectory() as out_dir:
+					monitor = ScratchMonitor(out_dir)
+					monitor.start()
+					start = time.perf_counter()
+					results[label] = ocr_part(pdf_path, 2, out_dir, executor, n, w, cache)
+					timings[label] = time.perf_counter() - start
+					monitor.done.set()
+					monitor.join()
+					scratch[label] = (monitor.peak_pages, monitor.peak_bytes)
+			finally:
+				if executor:
+					executor.shutdown()
+	for label, elapsed in timings.items():
+		peak_pages, peak_bytes = scratch[label]
+		print(f"{label}: {page_count} pages in {elapsed:.2f}s ({page_count / elapsed:.2f} pages/s), "
+			f"peak {peak_pages} rendered pages ({peak_bytes / 1e6:.0f} MB)")
+	same = len(set(json.dumps(r) for r in results.values())) == 1
+	print(f"Window {window}: {timings['whole part, sequential'] / timings['sequential']:.2f}x from overlapping rendering with OCR, "
+		f"{timings['sequential'] / timings[f'{workers} workers']:.1f}x from the pool, "
+		f"{timings['filling OCR cache'] / timings['from OCR cache']:.0f}x from the OCR cache, identical courses: {same}")
+
+# Full-page OCR against the region-of-interest modes on a two-column PDF: wall time, CPU time of this process and the
+# OCR processes (children only count once they exit, hence a pool per run) and, on the generated sample, how many of the
+# (number, title) pairs that were drawn come back exactly. On a real part (--bench-pdf) the modes are compared with
+# each other instead.
+def benchmark_layout(pdf_path=None, workers=OCR_WORKERS, threads=None, window=RENDER_WINDOW):
+	import resource
+	def cpu_time():
+		return sum(u.ru_utime + u.ru_stime for u in map(resource.getrusage, (resource.RUSAGE_SELF, resource.RUSAGE_CHILDREN)))
+	with tempfile.TemporaryDirectory() as tmp:
+		expected = None
+		if pdf_path is None:
+			pdf_path, expected = make_two_column_sample(os.path.join(tmp, 'sample.pdf'))
+		page_count = pdfinfo_from_path(pdf_path)['Pages']
+		results = {}
+		for mode in OCR_MODES:
+			cpu = cpu_time()
+			start = time.perf_counter()
+			executor = make_pool(workers, threads)
+			try:
+				with tempfile.TemporaryDirectory() as out_dir:
+					courses_by_page = ocr_part(pdf_path, 2, out_dir, executor, workers, window, None, mode)
+			finally:
+				if executor:
+					executor.shutdown()
+			elapsed = time.perf_counter() - start
+			results[mode] = ([c for courses in courses_by_page for c in courses], elapsed, cpu_time() - cpu)
+	reference = expected if expected is not None else results['page'][0]
+	truth = {(c['number'], c['title']) for c in reference}
+	for mode, (courses, elapsed, cpu) in results.items():
+		found = {(c['number'], c['title']) for c in courses}
+		line = (f"{mode:<8} {page_count} pages in {elapsed:.1f}s ({page_count / elapsed:.2f} pages/s), "
+			f"{cpu / page_count:.2f}s CPU per page, {len(courses)} courses")
+		if expected is not None:
+			line += (f", {len(found & truth)}/{len(truth)} drawn pairs exact ({len(found & truth) / len(truth):.0%} recall, "
+				f"{len(found & truth) / max(1, len(found)):.0%} precision)")
+		elif mode != 'page':
+			line += f", {len(found & truth)} pairs shared with page mode"
+		print(line)
 
 if __name__ == '__main__':
-	# Allow optional command-line argument to start at a specific part
-	start_part = 1
-	if len(sys.argv) > 1:
-		try:
-			start_part = int(sys.argv[1])
-		except Exception:
-			print("Invalid argument for start part, using 1.")
-	main(start_part)
+	parser = argparse.ArgumentParser(description='OCR the 1996 MIT catalog PDFs into a course list.')
+	parser.add_argument('start_part', nargs='?', type=int, default=1, help='resume from this part (earlier parts are loaded from the output file)')
+	parser.add_argument('--workers', type=int, default=OCR_WORKERS, help='OCR worker processes (default: one per CPU)')
+	parser.add_argument('--tesseract-threads', type=int, default=None, help='threads per tesseract call (default: CPUs / workers)')
+	parser.add_argument('--window', type=int, default=RENDER_WINDOW, help='pages rendered at a time')
+	parser.add_argument('--no-cache', action='store_true', help=f'ignore the OCR text cache in {OCR_CACHE_DIR}/ and OCR every page')
+	parser.add_argument('--refresh-pdfs', action='store_true', help=f'download the catalog PDFs again instead of using {PDF_CACHE_DIR}/')
+	parser.add_argument('--bench', action='store_true', help='time whole-part vs windowed rendering, sequential vs pooled OCR and the OCR cache on a local PDF')
+	parser.add_argument('--bench-layout', action='store_true', help='compare full-page and region-of-interest OCR on a two-column PDF')
+	parser.add_argument('--bench-pdf', default=None, help='PDF to benchmark on (default: a rendered sample)')
+	args = parser.parse_args()
+	if args.bench_layout:
+		benchmark_layout(args.bench_pdf, args.workers, args.tesseract_threads, args.window)
+	elif args.bench:
+		benchmark(args.bench_pdf, args.workers, args.tesseract_threads, args.window)
+	else:
+		main(args.start_part, args.workers, args.tesseract_threads, args.window, not args.no_cache, args.refresh_pdfs)
 # -----------------------------------------------
 #  10. Catalog 1996
 # 
@@ -1,4 +1,4 @@
-import requests
+import http_client
 from bs4 import BeautifulSoup
 import re
 import json
@@ -8,6 +8,10 @@ import string
 BASE_URL = "https://student.mit.edu/catalog/"
 OUTPUT_FILE = "11_mit_2026.json"
 
+# Files this script reads and writes (used by 09_pipeline.py to schedule it)
+INPUTS = []
+OUTPUTS = [OUTPUT_FILE]
+
 COURSE_PAT = re.compile(r"^([A-Z0-9]{1,4}\.[A-Za-z0-9]{2,4}(?:\[J\])?)\s+(.+?)\s*$")
 
 DEPARTMENT_CODES = [
@@ -21,7 +25,7 @@ SUFFIXES_COURSE4 = ["a", "b", "c", "d", "e", "f", "g"]
 
 def extract_courses_from_dept(url):
     try:
-        resp = requests.get(url)
+        resp = http_client.get(url)
         if resp.status_code != 200:
             return []
         soup = BeautifulSoup(resp.text, "html.parser")
@@ -56,6 +60,7 @@ def main():
     with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
         json.dump(all_courses, f, ensure_ascii=False, indent=2)
     print(f"Saved {len(all_courses)} courses to {OUTPUT_FILE}")
+    http_client.get_client().print_stats()
 
 if __name__ == "__main__":
     main()
@@ -12,65 +12,90 @@
 # -----------------------------------------------
 
 # To run code, must install matplotlib library
+# Usage: python 12_course_offerings.py             (saves the chart and opens it in a window)
+#        python 12_course_offerings.py --headless  (only saves the chart; also set by CATALOG_HEADLESS=1, which 09_pipeline.py uses)
+# matplotlib and numpy are imported only when the chart is drawn, so importing this module to reuse
+# count_courses() stays cheap
 
-import json
-import re
-import matplotlib.pyplot as plt
-import numpy as np
+import argparse
+import os
+import mit_catalog
 
-# Load course data
-with open('10_mit_1996.json', encoding='utf-8') as f:
-    data_1996 = json.load(f)
-with open('11_mit_2026.json', encoding='utf-8') as f:
-    data_2026 = json.load(f)
+FILE_1996 = '10_mit_1996.json'
+FILE_2026 = '11_mit_2026.json'
+OUTPUT_PNG = 'course_offerings_comparison.png'
+
+# Files this script reads and writes (used by 09_pipeline.py to schedule it)
+INPUTS = [FILE_1996, FILE_2026]
+OUTPUTS = [OUTPUT_PNG]
 
 # Extract department from course number (1-3 letters/numbers before period)
-def get_dept(course_number):
-    m = re.match(r'^([A-Z0-9]{1,3})\.', course_number)
-    return m.group(1) if m else None
+get_dept = mit_catalog.dept_of
 
-# Count courses per department for each year
+# Count courses per department for each year (departments are precomputed in the snapshot)
 def count_courses(data):
     dept_counts = {}
-    for course in data:
-        dept = get_dept(course['number'])
+    for dept in data.depts:
         if dept:
             dept_counts[dept] = dept_counts.get(dept, 0) + 1
     return dept_counts
 
-counts_1996 = count_courses(data_1996)
-counts_2026 = count_courses(data_2026)
+# Departments (union of both years, sorted) with the course count of each in 1996 and 2026
+def compare_offerings(file_1996=FILE_1996, file_2026=FILE_2026):
+    # Load course data (from the cached snapshots, see mit_catalog.py)
+    counts_1996 = count_courses(mit_catalog.load(file_1996))
+    counts_2026 = count_courses(mit_catalog.load(file_2026))
+
+    # Union of all departments
+    all_depts = sorted(set(counts_1996) | set(counts_2026))
+
+    vals_1996 = [counts_1996.get(dept, 0) for dept in all_depts]
+    vals_2026 = [counts_2026.get(dept, 0) for dept in all_depts]
+    return all_depts, vals_1996, vals_2026
+
+def plot_offerings(all_depts, vals_1996, vals_2026, headless=False):
+    if headless:
+        import matplotlib
+        matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    import numpy as np
 
-# Union of all departments
-all_depts = sorted(set(counts_1996) | set(counts_2026))
+    x = np.arange(len(all_depts)) * 2  # Increase spacing between bars
+    width = 0.7
 
-vals_1996 = [counts_1996.get(dept, 0) for dept in all_depts]
-vals_2026 = [counts_2026.get(dept, 0) for dept in all_depts]
+    fig, ax = plt.subplots(figsize=(22, 10))
 
-x = np.arange(len(all_depts)) * 2  # Increase spacing between bars
-width = 0.7
+    # Horizontal grouped bar chart
+    ax.bar(x - width/2, vals_1996, width, color='#4F81BD', label='1996')
+    ax.bar(x + width/2, vals_2026, width, color='#C0504D', label='2026')
 
-fig, ax = plt.subplots(figsize=(22, 10))
+    ax.set_ylabel('Number of Courses', fontsize=16)
+    ax.set_xlabel('Department', fontsize=16)
+    ax.set_title('Course Offerings by Department: 1996 vs 2026', fontsize=20, pad=20)
+    ax.set_xticks(x)
+    ax.set_xticklabels(all_depts, rotation=45, ha='right', fontsize=14)
+    ax.legend(fontsize=14)
 
-# Horizontal grouped bar chart
-bar_1996 = ax.bar(x - width/2, vals_1996, width, color='#4F81BD', label='1996')
-bar_2026 = ax.bar(x + width/2, vals_2026, width, color='#C0504D', label='2026')
+    # Add grid and value labels
+    ax.grid(axis='y', linestyle='--', alpha=0.7)
+    for i, (v96, v26) in enumerate(zip(vals_1996, vals_2026)):
+        if v96 > 0:
+            ax.text(x[i] - width/2, v96 + 2, str(v96), ha='center', color='#4F81BD', fontsize=12, fontweight='bold')
+        if v26 > 0:
+            ax.text(x[i] + width/2, v26 + 2, str(v26), ha='center', color='#C0504D', fontsize=12, fontweight='bold')
 
-ax.set_ylabel('Number of Courses', fontsize=16)
-ax.set_xlabel('Department', fontsize=16)
-ax.set_title('Course Offerings by Department: 1996 vs 2026', fontsize=20, pad=20)
-ax.set_xticks(x)
-ax.set_xticklabels(all_depts, rotation=45, ha='right', fontsize=14)
-ax.legend(fontsize=14)
+    plt.tight_layout()
+    plt.savefig(OUTPUT_PNG)
+    if headless:
+        plt.close(fig)
+    else:
+        plt.show()
 
-# Add grid and value labels
-ax.grid(axis='y', linestyle='--', alpha=0.7)
-for i, (v96, v26) in enumerate(zip(vals_1996, vals_2026)):
-    if v96 > 0:
-        ax.text(x[i] - width/2, v96 + 2, str(v96), ha='center', color='#4F81BD', fontsize=12, fontweight='bold')
-    if v26 > 0:
-        ax.text(x[i] + width/2, v26 + 2, str(v26), ha='center', color='#C0504D', fontsize=12, fontweight='bold')
+def main(headless=False):
+    plot_offerings(*compare_offerings(), headless=headless)
 
-plt.tight_layout()
-plt.savefig('course_offerings_comparison.png')
-plt.show()
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Chart course offerings per department, 1996 vs 2026.')
+    parser.add_argument('--headless', action='store_true', help='save the chart without opening a window')
+    args = parser.parse_args()
+    main(args.headless or os.environ.get('CATALOG_HEADLESS') == '1')
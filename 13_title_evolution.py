@@ -3,46 +3,39 @@
 
 Conduct a word frequency analysis on course titles from 1996 and 2024
 and compare the most common terms across both years.
+
+Usage: python 13_title_evolution.py             (saves the chart and opens it in a window)
+       python 13_title_evolution.py --headless  (only saves the chart; also set by CATALOG_HEADLESS=1)
+matplotlib and numpy are imported only when the chart is drawn.
 """
 
-import json
-import re
+import argparse
+import os
 from collections import Counter
 
-import matplotlib.pyplot as plt
-import numpy as np
+import mit_catalog
+import tokenizer
 
 FILE_1996 = "10_mit_1996.json"
 # Note: update this path if your 2024 data file uses a different name.
 FILE_2024 = "11_mit_2026.json"
 
+# Files this script reads and writes (used by 09_pipeline.py to schedule it)
+INPUTS = [FILE_1996, FILE_2024]
+OUTPUTS = ["title_word_frequency_1996_vs_2024.png"]
+
 TOP_N = 20
 
-STOPWORDS = {
-	"a", "an", "and", "as", "at", "by", "for", "from", "in", "into", "is",
-	"of", "on", "or", "the", "to", "with", "without", "via", "ii", "iii",
-	"i", "iv", "v", "vi", "vii", "viii", "ix", "x", "xi", "xii",
-	"advanced", "introduction", "intro", "seminar", "topics", "selected",
-}
+# Title filler words ('introduction', 'seminar', roman numerals, ...) are in tokenizer.py's 'mit_titles' profile
+STOPWORDS = tokenizer.MIT_TITLE_STOPWORDS
 
 
 def load_titles(path):
-	with open(path, encoding="utf-8") as f:
-		data = json.load(f)
-	return [item.get("title", "") for item in data]
+	return [title if title is not None else "" for title in mit_catalog.load(path).titles]
 
 
 def tokenize_titles(titles):
-	tokens = []
-	for title in titles:
-		words = re.findall(r"[A-Za-z0-9']+", title.lower())
-		for word in words:
-			if word in STOPWORDS:
-				continue
-			if len(word) < 2:
-				continue
-			tokens.append(word)
-	return tokens
+	return tokenizer.tokenize_batch(titles, "mit_titles")
 
 
 def top_terms(tokens, n):
@@ -54,7 +47,13 @@ def build_counts(tokens, vocab):
 	return [counter.get(term, 0) for term in vocab]
 
 
-def main():
+def main(headless=False):
+	if headless:
+		import matplotlib
+		matplotlib.use("Agg")
+	import matplotlib.pyplot as plt
+	import numpy as np
+
 	titles_1996 = load_titles(FILE_1996)
 	titles_2024 = load_titles(FILE_2024)
 
@@ -100,11 +99,17 @@ def main():
 	fig.text(0.5, 0.02, "* appears in both years", ha="center", fontsize=11)
 	plt.tight_layout(rect=[0, 0.05, 1, 0.95])
 	plt.savefig("title_word_frequency_1996_vs_2024.png")
-	plt.show()
+	if headless:
+		plt.close(fig)
+	else:
+		plt.show()
 
 
 if __name__ == "__main__":
-	main()
+	parser = argparse.ArgumentParser(description="Compare the most common MIT course title terms, 1996 vs 2024.")
+	parser.add_argument("--headless", action="store_true", help="save the chart without opening a window")
+	args = parser.parse_args()
+	main(args.headless or os.environ.get("CATALOG_HEADLESS") == "1")
 
 # Findings: many of the most common words in 1996 and 2024 were similar
 # The top two most common words in each year were the same (just in a different order)
@@ -8,22 +8,26 @@ that were not offered in 1996.
 import json
 import math
 
-import matplotlib.pyplot as plt
+import mit_catalog
 
 FILE_1996 = "10_mit_1996.json"
 FILE_2024 = "11_mit_2026.json"
 OUTPUT_FILE = "subjects_new_and_discontinued.json"
 OUTPUT_PNG = "subjects_new_and_discontinued.png"
+
+# Files this script reads and writes (used by 09_pipeline.py to schedule it)
+INPUTS = [FILE_1996, FILE_2024]
+OUTPUTS = [OUTPUT_FILE, OUTPUT_PNG]
+
 MAX_TITLES = 15
 
 
 def load_subjects(path):
-	with open(path, encoding="utf-8") as f:
-		data = json.load(f)
+	catalog = mit_catalog.load(path)
 	return [
-		{"number": item.get("number"), "title": item.get("title")}
-		for item in data
-		if item.get("number") and item.get("title")
+		{"number": number, "title": title}
+		for number, title in zip(catalog.numbers, catalog.titles)
+		if number and title
 	]
 
 
@@ -74,6 +78,9 @@ def main():
 
 
 def create_visual(discontinued_titles, new_titles, discontinued_total, new_total):
+	# Imported here so loading this module for its data functions doesn't pull in matplotlib
+	import matplotlib.pyplot as plt
+
 	fig, axes = plt.subplots(1, 2, figsize=(16, 10))
 
 	build_list_panel(
@@ -7,29 +7,26 @@ vs specialization using department diversity and cross-listing signals.
 
 import json
 import math
-import re
 
-import matplotlib.pyplot as plt
+import mit_catalog
 
 FILE_1996 = "10_mit_1996.json"
 FILE_2024 = "11_mit_2026.json"
 OUTPUT_JSON = "curriculum_breadth_summary.json"
 OUTPUT_PNG = "curriculum_breadth_summary.png"
 
-
-def load_courses(path):
-	with open(path, encoding="utf-8") as f:
-		return json.load(f)
+# Files this script reads and writes (used by 09_pipeline.py to schedule it)
+INPUTS = [FILE_1996, FILE_2024]
+OUTPUTS = [OUTPUT_JSON, OUTPUT_PNG]
 
 
-def dept_from_number(number):
-	match = re.match(r"^([A-Z0-9]{1,3})\.", number)
-	return match.group(1) if match else None
+def load_courses(path):
+	return mit_catalog.load(path)
 
 
-def is_cross_listed(number):
-	# Heuristic: joint subjects often use J or list multiple numbers with commas/dashes.
-	return ("J" in number) or ("," in number) or ("-" in number)
+# Departments and cross-listing flags are precomputed in the snapshot (see mit_catalog.py)
+dept_from_number = mit_catalog.dept_of
+is_cross_listed = mit_catalog.is_cross_listed
 
 
 def shannon_entropy(counts):
@@ -47,12 +44,10 @@ def shannon_entropy(counts):
 def summarize(courses):
 	dept_counts = {}
 	interdisciplinary = 0
-	for item in courses:
-		number = item.get("number", "")
-		dept = dept_from_number(number)
+	for dept, cross_listed in zip(courses.depts, courses.cross_listed):
 		if dept:
 			dept_counts[dept] = dept_counts.get(dept, 0) + 1
-		if number and is_cross_listed(number):
+		if cross_listed:
 			interdisciplinary += 1
 
 	total = len(courses)
@@ -92,6 +87,9 @@ def main():
 
 
 def create_visual(summary_1996, summary_2024):
+	# Imported here so loading this module for summarize() doesn't pull in matplotlib
+	import matplotlib.pyplot as plt
+
 	fig, axes = plt.subplots(1, 2, figsize=(14, 6))
 
 	# Unique Departments
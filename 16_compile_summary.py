@@ -4,7 +4,6 @@
 Automatically combine all visualization charts into a single PDF or multi-image output.
 """
 
-from PIL import Image
 import os
 
 # Image paths and their descriptions
@@ -17,9 +16,15 @@ IMAGES = [
 
 OUTPUT_PDF = "catalog_analysis_summary.pdf"
 
+# Files this script reads and writes (used by 09_pipeline.py to schedule it)
+INPUTS = [path for path, _ in IMAGES]
+OUTPUTS = [OUTPUT_PDF]
+
 
 def load_images():
     """Load all visualization images."""
+    # Pillow is only needed once there are images to load
+    from PIL import Image
     images = []
     for path, title in IMAGES:
         if os.path.exists(path):
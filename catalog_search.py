@@ -0,0 +1,209 @@
+# -----------------------------------------------
+#  Course search: SQLite catalog store with full-text search
+#
+#  Loads cleaned_courses.tsv into catalog.sqlite: a courses table with
+#  indexes on subject code and course number, plus an FTS5 index over
+#  title and description. Searching it takes milliseconds, where
+#  grepping catalog_export.csv means scanning the whole file.
+#
+#  Build (also run by 09_pipeline.py): python catalog_search.py
+#  Search:  python catalog_search.py 'machine learn*'
+#           python catalog_search.py '"data structures"' --subject CS
+#           python catalog_search.py ethics --min-credits 4 --limit 5
+#           python catalog_search.py --number 'CS 2500'
+#  Benchmark (indexed search vs scanning the CSV): python catalog_search.py --bench
+#
+#  Query syntax: plain words must all match, word* matches a prefix and
+#  "quoted words" must appear together as a phrase. Results are ranked by
+#  BM25, with title matches weighted above description matches.
+# -----------------------------------------------
+
+import argparse
+import csv
+import os
+import re
+import sqlite3
+import time
+import columnar
+
+INPUT_FILE = 'cleaned_courses.tsv'
+DB_FILE = 'catalog.sqlite'
+
+# Files this script reads and writes (used by 09_pipeline.py to schedule it)
+INPUTS = [INPUT_FILE]
+OUTPUTS = [DB_FILE]
+
+# Relative BM25 weights of the FTS columns (title, description)
+TITLE_WEIGHT = 10.0
+DESCRIPTION_WEIGHT = 1.0
+
+# A "quoted phrase" or a single word, optionally ending in * for a prefix search
+QUERY_TOKEN = re.compile(r'"([^"]*)"|([^\s"]+)')
+
+SCHEMA = """
+CREATE TABLE courses (
+	id INTEGER PRIMARY KEY,
+	subject TEXT,
+	number TEXT NOT NULL,
+	title TEXT,
+	credits TEXT,
+	credits_min REAL,
+	credits_max REAL,
+	description TEXT
+);
+CREATE INDEX courses_subject ON courses(subject);
+CREATE INDEX courses_number ON courses(number);
+CREATE VIRTUAL TABLE courses_fts USING fts5(
+	title, description, content='courses', content_rowid='id', tokenize='unicode61'
+);
+"""
+
+
+def build(in_file=INPUT_FILE, db_file=DB_FILE):
+	"""
+	(Re)build db_file from in_file and return the number of courses loaded.
+	The database is written to a temporary file first, so readers never see a half-built one.
+	"""
+	columns = columnar.read_columns(in_file, ['number', 'title', 'credits', 'description'])
+	rows = []
+	for number, title, credits, description in zip(columns['number'], columns['title'], columns['credits'], columns['description']):
+		low, high = columnar.parse_credits(credits)
+		rows.append((columnar.subject_of(number), number, title, credits, low, high, description))
+	tmp_file = db_file + '.tmp'
+	if os.path.exists(tmp_file):
+		os.remove(tmp_file)
+	conn = sqlite3.connect(tmp_file)
+	try:
+		conn.executescript(SCHEMA)
+		conn.executemany("INSERT INTO courses (subject, number, title, credits, credits_min, credits_max, description) "
+			"VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+		conn.execute("INSERT INTO courses_fts(courses_fts) VALUES ('rebuild')")
+		conn.execute("INSERT INTO courses_fts(courses_fts) VALUES ('optimize')")
+		conn.commit()
+	finally:
+		conn.close()
+	os.replace(tmp_file, db_file)
+	return len(rows)
+
+
+def is_fresh(in_file=INPUT_FILE, db_file=DB_FILE):
+	return os.path.exists(db_file) and os.path.getmtime(db_file) >= os.path.getmtime(in_file)
+
+
+def connect(db_file=DB_FILE, in_file=INPUT_FILE):
+	"""Open the catalog database, building it first if it's missing or older than the cleaned data."""
+	if not is_fresh(in_file, db_file):
+		build(in_file, db_file)
+	return sqlite3.connect(db_file)
+
+
+def fts_query(text):
+	"""
+	Translate the CLI query syntax into an FTS5 MATCH expression. Every word and phrase is
+	quoted, so punctuation in the input (e.g. 'C++' or 'AND') is matched literally instead of
+	being read as FTS5 syntax. Returns None if nothing searchable is left.
+	"""
+	terms = []
+	for phrase, word in QUERY_TOKEN.findall(text):
+		if phrase:
+			if phrase.strip():
+				terms.append('"' + phrase.replace('"', '') + '"')
+			continue
+		prefix = word.endswith('*')
+		word = word.rstrip('*')
+		if not re.search(r'\w', word):
+			continue
+		terms.append('"' + word + '"' + ('*' if prefix else ''))
+	return ' '.join(terms) or None
+
+
+def search(conn, query=None, subject=None, number=None, min_credits=None, max_credits=None, limit=20):
+	"""
+	Return up to `limit` courses as dicts, best match first. With no query the matches are
+	filtered only (subject, number prefix, credits) and come back in course-number order.
+	"""
+	where, params = [], []
+	match = fts_query(query) if query else None
+	if query and match is None:
+		return []
+	if match:
+		sql = ("SELECT c.number, c.title, c.credits, c.description, "
+			f"bm25(courses_fts, {TITLE_WEIGHT}, {DESCRIPTION_WEIGHT}) AS score "
+			"FROM courses_fts JOIN courses c ON c.id = courses_fts.rowid")
+		where.append("courses_fts MATCH ?")
+		params.append(match)
+		order = "score"
+	else:
+		sql = "SELECT c.number, c.title, c.credits, c.description, NULL AS score FROM courses c"
+		order = "c.id"
+	if subject:
+		where.append("c.subject = ?")
+		params.append(subject.upper())
+	if number:
+		# Course numbers are stored with a non-breaking space between subject and digits
+		where.append("c.number LIKE ? ESCAPE '\\'")
+		escaped = re.sub(r'([%_\\])', r'\\\1', number.upper())
+		params.append(re.sub(r'\s+', '\xa0', escaped) + '%')
+	if min_credits is not None:
+		where.append("c.credits_max >= ?")
+		params.append(min_credits)
+	if max_credits is not None:
+		where.append("c.credits_min <= ?")
+		params.append(max_credits)
+	if where:
+		sql += " WHERE " + " AND ".join(where)
+	sql += f" ORDER BY {order} LIMIT ?"
+	params.append(limit)
+	keys = ('number', 'title', 'credits', 'description', 'score')
+	return [dict(zip(keys, row)) for row in conn.execute(sql, params)]
+
+
+def print_results(results, width=100):
+	for r in results:
+		# bm25() scores are negative, lower is better; shown flipped so higher is better
+		score = f"{-r['score']:7.2f}" if r['score'] is not None else ''
+		description = r['description'] or ''
+		print(f"{score:>7}  {r['number'].replace(chr(0xa0), ' ')}  {r['title']} ({r['credits']} credits)")
+		print(f"{'':9}{description[:width]}{'...' if len(description) > width else ''}")
+	print(f"{len(results)} result(s)")
+
+
+# Same queries through the index and by scanning catalog_export.csv the way a grep would
+def benchmark(queries=('algorithm', 'machine learn*', '"data structures"', 'ethics', 'organic chemistry'), repeat=20):
+	conn = connect()
+	rows = conn.execute("SELECT COUNT(*) FROM courses").fetchone()[0]
+	print(f"{rows} courses in {DB_FILE} ({os.path.getsize(DB_FILE) / 1e6:.2f} MB)")
+	for query in queries:
+		start = time.perf_counter()
+		for _ in range(repeat):
+			results = search(conn, query)
+		indexed = (time.perf_counter() - start) / repeat
+		words = [w.rstrip('*').lower() for w in re.findall(r'[^\s"]+', query)]
+		start = time.perf_counter()
+		with open('catalog_export.csv', 'r', encoding='utf-8', newline='') as f:
+			scanned = sum(1 for row in csv.reader(f) if all(w in (row[1] + ' ' + row[3]).lower() for w in words))
+		scan = time.perf_counter() - start
+		print(f"{query!r:<22} index {indexed * 1000:7.2f} ms ({len(results)} shown)   csv scan {scan * 1000:7.1f} ms ({scanned} substring matches)")
+	conn.close()
+
+
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser(description='Build and search the SQLite course catalog.')
+	parser.add_argument('query', nargs='?', help='search text (words, prefix*, "a phrase"); omit to just rebuild the database')
+	parser.add_argument('--subject', help='only courses with this subject code, e.g. CS')
+	parser.add_argument('--number', help="course number or prefix, e.g. 'CS 25'")
+	parser.add_argument('--min-credits', type=float, help='only courses that can be taken for at least this many credits')
+	parser.add_argument('--max-credits', type=float, help='only courses that can be taken for at most this many credits')
+	parser.add_argument('--limit', type=int, default=20, help='max results')
+	parser.add_argument('--bench', action='store_true', help='time indexed search against scanning catalog_export.csv')
+	args = parser.parse_args()
+	filters = (args.subject, args.number, args.min_credits, args.max_credits)
+	if args.bench:
+		benchmark()
+	elif args.query is None and all(f is None for f in filters):
+		count = build()
+		print(f"Loaded {count} courses into {DB_FILE}")
+	else:
+		conn = connect()
+		print_results(search(conn, args.query, args.subject, args.number, args.min_credits, args.max_credits, args.limit))
+		conn.close()
@@ -0,0 +1,194 @@
+# -----------------------------------------------
+#  Columnar (Parquet) copies of the course tables
+#
+#  03_parse.py and 04_clean.py write a .parquet file next to their TSV
+#  output with typed columns: the subject code is dictionary-encoded and
+#  credits are parsed to numbers. Readers such as 05_extract.py and
+#  08_export.py can then load only the columns they need instead of
+#  splitting every line of the TSV (most of which is descriptions).
+#
+#  The copy is written a row group at a time (CourseWriter), alongside the
+#  TSV, so writing it doesn't need the whole table in memory.
+#
+#  Needs pyarrow (pip install pyarrow). Without it nothing is written and
+#  read_columns() falls back to reading the TSV.
+#
+#  Benchmark: python columnar.py
+# -----------------------------------------------
+
+import csv
+import os
+import re
+import time
+import tracemalloc
+
+try:
+	import pyarrow as pa
+	import pyarrow.parquet as pq
+except ImportError:
+	pa = pq = None
+
+SUBJECT_PAT = re.compile(r'^([A-Z]+)')
+CREDITS_PAT = re.compile(r'^(\d+(?:\.\d+)?)(?:-(\d+(?:\.\d+)?))?$')
+# Rows per Parquet row group, i.e. the most rows a CourseWriter holds in memory
+ROW_GROUP_ROWS = 10000
+
+if pa is not None:
+	SCHEMA = pa.schema([
+		('subject', pa.dictionary(pa.int16(), pa.string())),
+		('number', pa.string()),
+		('title', pa.string()),
+		('credits', pa.string()),  # original text, e.g. '1-4', so the TSV can be reproduced exactly
+		('credits_min', pa.float32()),
+		('credits_max', pa.float32()),
+		('description', pa.string()),
+	])
+
+
+def parquet_path(tsv_path):
+	return os.path.splitext(tsv_path)[0] + '.parquet'
+
+
+def subject_of(number):
+	match = SUBJECT_PAT.match(number)
+	return match.group(1) if match else None
+
+
+# '4' -> (4.0, 4.0), '1-4' -> (1.0, 4.0), anything else -> (None, None)
+def parse_credits(credits):
+	match = CREDITS_PAT.match(credits)
+	if not match:
+		return None, None
+	low, high = match.groups()
+	return float(low), float(high or low)
+
+
+def typed_columns(rows):
+	columns = {name: [] for name in SCHEMA.names}
+	for number, title, credits, description in rows:
+		low, high = parse_credits(credits)
+		columns['subject'].append(subject_of(number))
+		columns['number'].append(number)
+		columns['title'].append(title)
+		columns['credits'].append(credits)
+		columns['credits_min'].append(low)
+		columns['credits_max'].append(high)
+		columns['description'].append(description)
+	return pa.table(columns, schema=SCHEMA)
+
+
+class CourseWriter:
+	"""
+	Incremental writer for the .parquet file next to tsv_path: rows of [number, title, credits,
+	description] are added one at a time and written out as a row group every chunk_rows rows,
+	so memory stays bounded by chunk_rows whatever the size of the table. The file is written
+	under a temporary name and only moved into place by close(). Does nothing if pyarrow isn't
+	installed (path is then None).
+	"""
+	def __init__(self, tsv_path, chunk_rows=ROW_GROUP_ROWS):
+		self.path = parquet_path(tsv_path) if pa is not None else None
+		self.chunk_rows = chunk_rows
+		self.rows = []
+		self.writer = None
+		if self.path is not None:
+			self.tmp_path = self.path + '.tmp'
+			self.writer = pq.ParquetWriter(self.tmp_path, SCHEMA, compression='zstd')
+
+	def write(self, row):
+		if self.writer is None:
+			return
+		self.rows.append(row)
+		if len(self.rows) >= self.chunk_rows:
+			self.flush()
+
+	def flush(self):
+		if self.rows:
+			self.writer.write_table(typed_columns(self.rows))
+			self.rows = []
+
+	def close(self):
+		if self.writer is None:
+			return
+		self.flush()
+		self.writer.close()
+		os.replace(self.tmp_path, self.path)
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, exc_type, exc, tb):
+		if exc_type is None:
+			self.close()
+		elif self.writer is not None:
+			self.writer.close()
+			os.remove(self.tmp_path)
+
+
+def write_courses(rows, tsv_path):
+	"""
+	Write rows of [number, title, credits, description] to the .parquet file next to tsv_path.
+	Returns the path written, or None if pyarrow isn't installed.
+	"""
+	with CourseWriter(tsv_path) as writer:
+		for row in rows:
+			writer.write(row)
+	return writer.path
+
+
+# The Parquet copy is only trusted if it was written after the TSV it mirrors
+def is_fresh(tsv_path):
+	path = parquet_path(tsv_path)
+	return pq is not None and os.path.exists(path) and os.path.getmtime(path) >= os.path.getmtime(tsv_path)
+
+
+def read_columns(tsv_path, columns):
+	"""
+	Return {column: list of values} for the requested columns, from the Parquet copy when it's
+	available and up to date, otherwise from the TSV (which only has the four original columns).
+	"""
+	if is_fresh(tsv_path):
+		table = pq.read_table(parquet_path(tsv_path), columns=columns)
+		return {name: table.column(name).to_pylist() for name in columns}
+	result = {name: [] for name in columns}
+	with open(tsv_path, 'r', encoding='utf-8') as f:
+		for row in csv.DictReader(f, delimiter='\t'):
+			for name in columns:
+				result[name].append(row[name])
+	return result
+
+
+# Time and memory to load just number + title, from the TSV vs from Parquet
+def benchmark(tsv_path='cleaned_courses.tsv', columns=('number', 'title')):
+	if not is_fresh(tsv_path):
+		print(f"No up-to-date {parquet_path(tsv_path)}; run 04_clean.py with pyarrow installed first.")
+		return
+	def load_tsv():
+		result = {name: [] for name in columns}
+		with open(tsv_path, 'r', encoding='utf-8') as f:
+			for row in csv.DictReader(f, delimiter='\t'):
+				for name in columns:
+					result[name].append(row[name])
+		return result
+	def load_parquet():
+		table = pq.read_table(parquet_path(tsv_path), columns=list(columns))
+		return {name: table.column(name).to_pylist() for name in columns}
+	for label, fn in [('tsv', load_tsv), ('parquet', load_parquet)]:
+		# Best of a few runs after a warm-up call (the first Parquet read also pays for Arrow's one-time setup)
+		fn()
+		elapsed = None
+		for _ in range(5):
+			start = time.perf_counter()
+			fn()
+			run = time.perf_counter() - start
+			elapsed = run if elapsed is None else min(elapsed, run)
+		# Arrow's own buffers live outside tracemalloc, but they're freed once to_pylist() has copied the values out
+		tracemalloc.start()
+		fn()
+		peak = tracemalloc.get_traced_memory()[1]
+		tracemalloc.stop()
+		print(f"{label}: {elapsed * 1000:.1f} ms, peak Python memory {peak / 1e6:.1f} MB")
+	print(f"File size: tsv {os.path.getsize(tsv_path) / 1e6:.2f} MB, parquet {os.path.getsize(parquet_path(tsv_path)) / 1e6:.2f} MB")
+
+
+if __name__ == '__main__':
+	benchmark()
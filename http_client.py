@@ -0,0 +1,128 @@
+# -----------------------------------------------
+#  Shared HTTP client for the scrapers
+#  (01_pull.py, 10_extract_1996.py, 11_extract_2024.py, debug_links.py)
+#
+#  One pooled requests.Session per process, so repeated requests to the
+#  same host reuse keep-alive (and TLS) connections instead of opening a
+#  new one every time. Also sets a common timeout/retry policy, asks for
+#  compressed responses, caps concurrent requests per host and keeps
+#  simple counters for requests, bytes and latency.
+# -----------------------------------------------
+
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+HEADERS = {"User-Agent": "Mozilla/5.0 (compatible; CatalogScraper/1.0)"}
+TIMEOUT = (10, 60)  # (connect, read) seconds
+RETRIES = 3
+BACKOFF = 0.5
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+PER_HOST_LIMIT = 8
+POOL_SIZE = 16
+
+# urllib3 only decodes brotli when a brotli package is installed, so only advertise it then
+try:
+	import brotli  # noqa: F401
+	ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+	ACCEPT_ENCODING = "gzip, deflate"
+
+
+class CatalogClient:
+	"""
+	Pooled HTTP client with retries, per-host concurrency caps and request counters.
+	Safe to share between threads (e.g. asyncio.to_thread workers). The connection pool defaults
+	to POOL_SIZE, or per_host if that's larger, so every request allowed in flight has a connection.
+	"""
+	def __init__(self, headers=None, timeout=TIMEOUT, retries=RETRIES, backoff=BACKOFF,
+			per_host=PER_HOST_LIMIT, pool_size=None):
+		pool_size = pool_size or max(POOL_SIZE, per_host)
+		self.timeout = timeout
+		self.per_host = per_host
+		self.session = requests.Session()
+		self.session.headers.update(HEADERS)
+		self.session.headers["Accept-Encoding"] = ACCEPT_ENCODING
+		if headers:
+			self.session.headers.update(headers)
+		retry = Retry(
+			total=retries,
+			backoff_factor=backoff,
+			backoff_jitter=backoff,
+			status_forcelist=RETRY_STATUSES,
+			allowed_methods=["GET", "HEAD"],
+			raise_on_status=False,
+		)
+		adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+		self.session.mount("http://", adapter)
+		self.session.mount("https://", adapter)
+		self._host_limits = {}
+		self._lock = threading.Lock()
+		self.counters = {"requests": 0, "errors": 0, "bytes": 0, "wire_bytes": 0, "latency": 0.0}
+
+	def _host_limit(self, url):
+		host = urlsplit(url).netloc
+		with self._lock:
+			if host not in self._host_limits:
+				self._host_limits[host] = threading.BoundedSemaphore(self.per_host)
+			return self._host_limits[host]
+
+	def get(self, url, **kwargs):
+		kwargs.setdefault("timeout", self.timeout)
+		start = time.perf_counter()
+		with self._host_limit(url):
+			try:
+				resp = self.session.get(url, **kwargs)
+			except requests.RequestException:
+				with self._lock:
+					self.counters["requests"] += 1
+					self.counters["errors"] += 1
+					self.counters["latency"] += time.perf_counter() - start
+				raise
+		elapsed = time.perf_counter() - start
+		# resp.content is the decoded body; raw.tell() is what actually came over the wire
+		size = len(resp.content)
+		try:
+			wire = resp.raw.tell()
+		except Exception:
+			wire = size
+		with self._lock:
+			self.counters["requests"] += 1
+			self.counters["errors"] += resp.status_code >= 400
+			self.counters["bytes"] += size
+			self.counters["wire_bytes"] += wire
+			self.counters["latency"] += elapsed
+		return resp
+
+	def stats(self):
+		with self._lock:
+			stats = dict(self.counters)
+		stats["avg_latency"] = stats["latency"] / stats["requests"] if stats["requests"] else 0.0
+		return stats
+
+	def print_stats(self):
+		s = self.stats()
+		print(f"HTTP: {s['requests']} requests ({s['errors']} errors), {s['bytes'] / 1e6:.2f} MB "
+			f"({s['wire_bytes'] / 1e6:.2f} MB on the wire), avg latency {s['avg_latency'] * 1000:.0f} ms")
+
+	def close(self):
+		self.session.close()
+
+
+_default_client = None
+_default_lock = threading.Lock()
+
+# Process-wide client so every caller shares one connection pool
+def get_client():
+	global _default_client
+	with _default_lock:
+		if _default_client is None:
+			_default_client = CatalogClient()
+		return _default_client
+
+def get(url, **kwargs):
+	return get_client().get(url, **kwargs)
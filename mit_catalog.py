@@ -0,0 +1,191 @@
+# -----------------------------------------------
+#  Shared loader for the MIT course lists
+#  (10_mit_1996.json, 11_mit_2026.json), used by scripts 12-15
+#
+#  The first load of a JSON file writes a compact binary snapshot of it
+#  to mit_snapshots/: every distinct string (numbers, titles, department
+#  codes) once in a string table, then per course the table index of its
+#  number, title and department plus a cross-listing flag. Later loads
+#  read the snapshot instead of parsing JSON and re-deriving departments,
+#  and get back interned strings, so repeated titles and department codes
+#  are shared objects.
+#
+#  The snapshot records the sha256 of the JSON it came from and is
+#  rebuilt whenever that changes. It also records the JSON's size and
+#  mtime, so while those still match the file isn't even re-hashed.
+#
+#  Benchmark: python mit_catalog.py
+# -----------------------------------------------
+
+import hashlib
+import json
+import os
+import re
+import struct
+import sys
+import tempfile
+import time
+from array import array
+
+FILE_1996 = '10_mit_1996.json'
+FILE_2026 = '11_mit_2026.json'
+SNAPSHOT_DIR = 'mit_snapshots'
+
+# Department: the 1-3 letters/digits before the period in the course number (e.g. '6' in '6.001', 'HST' in 'HST.011')
+DEPT_PAT = re.compile(r'^([A-Z0-9]{1,3})\.')
+
+MAGIC = b'MITSNAP1'
+HEADER = struct.Struct('<8s32sQqII')  # magic, sha256, size and mtime (ns) of the source JSON, courses, strings
+CROSS_LISTED = 1
+
+
+def dept_of(number):
+	match = DEPT_PAT.match(number)
+	return match.group(1) if match else None
+
+
+# Heuristic: joint subjects often use J or list multiple numbers with commas/dashes
+def is_cross_listed(number):
+	return ('J' in number) or (',' in number) or ('-' in number)
+
+
+class Catalog:
+	"""
+	One year's course list as parallel lists: numbers, titles and depts (None where the JSON has
+	no value, or the number has no department prefix) and cross_listed flags.
+	"""
+	def __init__(self, numbers, titles, depts, cross_listed):
+		self.numbers = numbers
+		self.titles = titles
+		self.depts = depts
+		self.cross_listed = cross_listed
+
+	def __len__(self):
+		return len(self.numbers)
+
+	def records(self):
+		"""The courses as {'number', 'title'} dicts, like the JSON file."""
+		return [{'number': number, 'title': title} for number, title in zip(self.numbers, self.titles)]
+
+
+def snapshot_path(json_path, snapshot_dir=SNAPSHOT_DIR):
+	return os.path.join(snapshot_dir, os.path.basename(json_path) + '.snap')
+
+
+def from_json(raw):
+	data = json.loads(raw)
+	numbers = [item.get('number') for item in data]
+	titles = [item.get('title') for item in data]
+	depts = [dept_of(number) if number else None for number in numbers]
+	cross_listed = [bool(number) and is_cross_listed(number) for number in numbers]
+	return Catalog(numbers, titles, depts, cross_listed)
+
+
+# A missing value (None) is stored as the index one past the last string
+def write_snapshot(catalog, source, path):
+	digest, size, mtime_ns = source
+	strings = {}
+	values = (catalog.numbers, catalog.titles, catalog.depts)
+	for column in values:
+		for value in column:
+			if value is not None and value not in strings:
+				strings[value] = len(strings)
+	missing = len(strings)
+	numbers, titles, depts = (array('I', (strings.get(value, missing) if value is not None else missing for value in column)) for column in values)
+	flags = array('B', (CROSS_LISTED if flag else 0 for flag in catalog.cross_listed))
+	# Strings are NUL-separated so loading is one decode and one split (course data never contains NUL)
+	blob = '\0'.join(strings).encode('utf-8')
+	directory = os.path.dirname(path) or '.'
+	os.makedirs(directory, exist_ok=True)
+	# A temp file of its own per writer: scripts 12-15 run in parallel and may all write the same snapshot at once,
+	# and each os.replace then swaps in a complete file
+	fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=os.path.basename(path) + '.', suffix='.tmp')
+	try:
+		with os.fdopen(fd, 'wb') as f:
+			f.write(HEADER.pack(MAGIC, digest, size, mtime_ns, len(catalog), len(strings)))
+			f.write(struct.pack('<Q', len(blob)))
+			f.write(blob)
+			for column in (numbers, titles, depts, flags):
+				column.tofile(f)
+		os.replace(tmp_path, path)
+	except BaseException:
+		os.remove(tmp_path)
+		raise
+
+
+def read_header(path):
+	try:
+		with open(path, 'rb') as f:
+			data = f.read()
+	except FileNotFoundError:
+		return None, None
+	if len(data) < HEADER.size + 8 or data[:len(MAGIC)] != MAGIC:
+		return None, None
+	return HEADER.unpack_from(data, 0), data
+
+
+def read_snapshot(header, data):
+	_, _, _, _, count, n_strings = header
+	offset = HEADER.size
+	(blob_size,) = struct.unpack_from('<Q', data, offset)
+	offset += 8
+	strings = list(map(sys.intern, data[offset:offset + blob_size].decode('utf-8').split('\0'))) if n_strings else []
+	strings.append(None)  # index n_strings means missing
+	offset += blob_size
+	columns = []
+	for code in ('I', 'I', 'I', 'B'):
+		column = array(code)
+		column.frombytes(data[offset:offset + count * column.itemsize])
+		offset += count * column.itemsize
+		columns.append(column)
+	numbers, titles, depts, flags = columns
+	lookup = strings.__getitem__
+	return Catalog(list(map(lookup, numbers)), list(map(lookup, titles)), list(map(lookup, depts)), list(map(bool, flags)))
+
+
+def load(json_path, snapshot_dir=SNAPSHOT_DIR):
+	"""
+	Load one MIT course list, from its snapshot when that was made from the same JSON content,
+	otherwise from the JSON (refreshing the snapshot).
+	"""
+	path = snapshot_path(json_path, snapshot_dir)
+	stat = os.stat(json_path)
+	header, data = read_header(path)
+	if header is not None and (header[2], header[3]) == (stat.st_size, stat.st_mtime_ns):
+		return read_snapshot(header, data)
+	with open(json_path, 'rb') as f:
+		raw = f.read()
+	digest = hashlib.sha256(raw).digest()
+	if header is not None and header[1] == digest:
+		catalog = read_snapshot(header, data)
+	else:
+		catalog = from_json(raw)
+	# Rewritten even on a hash match, to record the new size/mtime
+	write_snapshot(catalog, (digest, stat.st_size, stat.st_mtime_ns), path)
+	return catalog
+
+
+# What each analysis script used to do (json.load + a department regex per course) against loading the snapshot
+def benchmark(paths=(FILE_1996, FILE_2026), repeat=20):
+	def from_scratch(path):
+		with open(path, encoding='utf-8') as f:
+			data = json.load(f)
+		return [dept_of(item['number']) for item in data]
+	for path in paths:
+		load(path)  # make sure the snapshot exists
+		timings = {}
+		for label, fn in (('json + regex', from_scratch), ('snapshot', load)):
+			best = None
+			for _ in range(repeat):
+				start = time.perf_counter()
+				fn(path)
+				elapsed = time.perf_counter() - start
+				best = elapsed if best is None else min(best, elapsed)
+			timings[label] = best
+		same = vars(load(path)) == vars(from_json(open(path, 'rb').read()))
+		print(f"{path}: json + regex {timings['json + regex'] * 1000:.2f} ms, snapshot {timings['snapshot'] * 1000:.2f} ms "
+			f"({os.path.getsize(path) / 1e3:.0f} KB JSON, {os.path.getsize(snapshot_path(path)) / 1e3:.0f} KB snapshot), identical: {same}")
+
+
+if __name__ == '__main__':
+	benchmark()
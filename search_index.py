@@ -0,0 +1,363 @@
+# -----------------------------------------------
+#  In-process BM25 search over course titles and descriptions
+#
+#  A small pure-Python inverted index built from the courses 03_parse.py
+#  extracts (parsed_courses.tsv). Unlike catalog_search.py it needs no
+#  database: the term dictionary, posting lists and per-document data are
+#  flat typed arrays, written one after another into catalog_index.bin.
+#  Loading mmaps that file and casts each section to a memoryview, so a
+#  new process can query straight away without rebuilding or copying
+#  anything.
+#
+#  Queries are ranked with BM25 (title words count TITLE_BOOST times) and
+#  return the top k using MaxScore: each term's highest possible score
+#  contribution is stored at build time, and once k results are found,
+#  terms that can no longer lift a document into the top k stop driving
+#  the search and are only probed for documents the others already found.
+#
+#  Build (also run by 09_pipeline.py): python search_index.py
+#  Search:    python search_index.py 'distributed systems' -k 5
+#  Benchmark: python search_index.py --bench --scales 1,10,100
+# -----------------------------------------------
+
+import argparse
+import bisect
+import heapq
+import math
+import mmap
+import os
+import re
+import struct
+import tempfile
+import time
+from array import array
+from collections import Counter
+import columnar
+
+INPUT_FILE = 'parsed_courses.tsv'
+INDEX_FILE = 'catalog_index.bin'
+
+# Files this script reads and writes (used by 09_pipeline.py to schedule it)
+INPUTS = [INPUT_FILE]
+OUTPUTS = [INDEX_FILE]
+
+K1 = 1.2
+B = 0.75
+TITLE_BOOST = 3
+TOKEN_PAT = re.compile(r'[a-z0-9]+')
+# Relative padding on the float32 per-term score bounds used for MaxScore pruning
+BOUND_SLACK = 1 + 1e-6
+
+MAGIC = b'CATIDX\x00\x01'
+HEADER = struct.Struct('<8sIIdd')  # magic, documents, terms, k1, b
+# Sections in file order: (name, array typecode). Each is stored as (offset, item count) after the header
+SECTIONS = [
+	('term_offsets', 'Q'),  # n_terms + 1 offsets into term_blob
+	('term_blob', 'B'),     # terms as UTF-8, sorted by their bytes so lookups can binary search
+	('post_offsets', 'Q'),  # n_terms + 1 offsets into doc_ids / tfs
+	('doc_ids', 'I'),       # posting lists, ascending doc ids per term
+	('tfs', 'H'),           # weighted term frequency for each posting
+	('max_scores', 'f'),    # per term: highest BM25 contribution any document gets from it
+	('doc_norms', 'f'),     # per document: k1 * (1 - b + b * length / average length)
+	('doc_offsets', 'Q'),   # n_docs + 1 offsets into doc_blob
+	('doc_blob', 'B'),      # "number\ttitle" per document, for showing results
+]
+SECTION_ENTRY = struct.Struct('<QQ')
+ALIGN = 8
+
+
+def tokenize(text):
+	return TOKEN_PAT.findall(text.lower())
+
+
+def iter_documents(in_file=INPUT_FILE):
+	"""(number, title, description) for every course in in_file."""
+	columns = columnar.read_columns(in_file, ['number', 'title', 'description'])
+	return zip(columns['number'], columns['title'], columns['description'])
+
+
+def build(documents):
+	"""
+	Build the index sections from (number, title, description) tuples.
+	Returns (sections dict of arrays, n_docs, n_terms).
+	"""
+	term_ids = {}
+	postings = []  # per term id: [array of doc ids, array of tfs]
+	doc_lengths = array('I')
+	doc_offsets = array('Q', [0])
+	doc_blob = bytearray()
+	for doc, (number, title, description) in enumerate(documents):
+		counts = Counter(tokenize(description))
+		for token in tokenize(title):
+			counts[token] += TITLE_BOOST
+		doc_lengths.append(sum(counts.values()))
+		for token, tf in counts.items():
+			term = term_ids.get(token)
+			if term is None:
+				term = term_ids[token] = len(postings)
+				postings.append((array('I'), array('H')))
+			ids, tfs = postings[term]
+			ids.append(doc)
+			tfs.append(min(tf, 0xFFFF))
+		doc_blob += f"{number}\t{title}".encode('utf-8')
+		doc_offsets.append(len(doc_blob))
+	n_docs = len(doc_lengths)
+	avgdl = sum(doc_lengths) / n_docs if n_docs else 1.0
+	doc_norms = array('f', (K1 * (1 - B + B * length / avgdl) for length in doc_lengths))
+
+	terms = sorted(term_ids, key=lambda t: t.encode('utf-8'))
+	term_offsets = array('Q', [0])
+	term_blob = bytearray()
+	post_offsets = array('Q', [0])
+	doc_ids = array('I')
+	all_tfs = array('H')
+	max_scores = array('f')
+	for token in terms:
+		ids, tfs = postings[term_ids[token]]
+		term_blob += token.encode('utf-8')
+		term_offsets.append(len(term_blob))
+		doc_ids.extend(ids)
+		all_tfs.extend(tfs)
+		post_offsets.append(len(doc_ids))
+		w = idf(n_docs, len(ids))
+		max_scores.append(max(w * tf * (K1 + 1) / (tf + doc_norms[d]) for d, tf in zip(ids, tfs)))
+	sections = {
+		'term_offsets': term_offsets, 'term_blob': array('B', term_blob),
+		'post_offsets': post_offsets, 'doc_ids': doc_ids, 'tfs': all_tfs, 'max_scores': max_scores,
+		'doc_norms': doc_norms, 'doc_offsets': doc_offsets, 'doc_blob': array('B', doc_blob),
+	}
+	return sections, n_docs, len(terms)
+
+
+def idf(n_docs, df):
+	return math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+
+
+def write_index(sections, n_docs, n_terms, path=INDEX_FILE):
+	"""Write the sections to path (via a temporary file), each aligned so it can be cast in place."""
+	table_size = HEADER.size + SECTION_ENTRY.size * len(SECTIONS)
+	offset = table_size
+	entries = []
+	for name, _ in SECTIONS:
+		offset += -offset % ALIGN
+		data = sections[name]
+		entries.append((offset, len(data)))
+		offset += len(data) * data.itemsize
+	tmp_path = path + '.tmp'
+	with open(tmp_path, 'wb') as f:
+		f.write(HEADER.pack(MAGIC, n_docs, n_terms, K1, B))
+		for entry in entries:
+			f.write(SECTION_ENTRY.pack(*entry))
+		for (name, _), (start, _) in zip(SECTIONS, entries):
+			f.write(b'\0' * (start - f.tell()))
+			sections[name].tofile(f)
+	os.replace(tmp_path, path)
+	return path
+
+
+class SearchIndex:
+	"""
+	Read-only view of an index file. Every section is a memoryview over the mmap,
+	so opening costs the same whatever the index size.
+	"""
+	def __init__(self, path=INDEX_FILE):
+		self.path = path
+		with open(path, 'rb') as f:
+			self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+		magic, self.n_docs, self.n_terms, self.k1, self.b = HEADER.unpack_from(self._mmap, 0)
+		if magic != MAGIC:
+			raise ValueError(f"{path} is not a search index (or was written by another version)")
+		view = memoryview(self._mmap)
+		for i, (name, code) in enumerate(SECTIONS):
+			start, count = SECTION_ENTRY.unpack_from(self._mmap, HEADER.size + i * SECTION_ENTRY.size)
+			size = array(code).itemsize
+			setattr(self, name, view[start:start + count * size].cast(code))
+
+	def close(self):
+		for name, _ in SECTIONS:
+			getattr(self, name).release()
+		self._mmap.close()
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, *exc):
+		self.close()
+
+	def term_id(self, token):
+		"""Binary search the sorted term blob; returns None for unknown terms."""
+		key = token.encode('utf-8')
+		offsets, blob = self.term_offsets, self.term_blob
+		lo, hi = 0, self.n_terms
+		while lo < hi:
+			mid = (lo + hi) // 2
+			term = blob[offsets[mid]:offsets[mid + 1]].tobytes()
+			if term < key:
+				lo = mid + 1
+			elif term > key:
+				hi = mid
+			else:
+				return mid
+		return None
+
+	def document(self, doc):
+		number, title = bytes(self.doc_blob[self.doc_offsets[doc]:self.doc_offsets[doc + 1]]).decode('utf-8').split('\t', 1)
+		return number, title
+
+	# (upper bound, idf, doc ids, tfs) for each distinct known query term
+	def _query_terms(self, query):
+		terms = []
+		for token in dict.fromkeys(tokenize(query)):
+			term = self.term_id(token)
+			if term is None:
+				continue
+			start, end = self.post_offsets[term], self.post_offsets[term + 1]
+			terms.append((self.max_scores[term], idf(self.n_docs, end - start), self.doc_ids[start:end], self.tfs[start:end]))
+		return terms
+
+	def search(self, query, k=10):
+		"""
+		Top k (score, doc) pairs for query, best first, using MaxScore early termination.
+		Ties are broken by lower doc id, and each document's contributions are added up in the same
+		term order as search_exhaustive(), so the result is the same down to the last bit.
+		"""
+		terms = sorted(self._query_terms(query), key=lambda t: t[0])
+		if not terms or k <= 0:
+			return []
+		norms = self.doc_norms
+		k1 = self.k1 + 1
+		# bounds[i]: most that terms 0..i together can add to a score. Padded a little, since max_scores are
+		# float32 and may round below the real contribution; a loose bound only costs a little pruning
+		bounds = []
+		total = 0.0
+		for ub, _, _, _ in terms:
+			total += ub * BOUND_SLACK
+			bounds.append(total)
+		cursors = [0] * len(terms)
+		lengths = [len(ids) for _, _, ids, _ in terms]
+		heap = []
+		threshold = -1.0
+		first = 0  # terms[first:] are essential: a document has to contain one of them to make the top k
+		while first < len(terms):
+			doc = None
+			for j in range(first, len(terms)):
+				if cursors[j] < lengths[j]:
+					d = terms[j][2][cursors[j]]
+					if doc is None or d < doc:
+						doc = d
+			if doc is None:
+				break
+			score = 0.0
+			norm = norms[doc]
+			hits = []  # (term, contribution)
+			for j in range(first, len(terms)):
+				c = cursors[j]
+				_, w, ids, tfs = terms[j]
+				if c < lengths[j] and ids[c] == doc:
+					tf = tfs[c]
+					hits.append((j, w * tf * k1 / (tf + norm)))
+					score += hits[-1][1]
+					cursors[j] = c + 1
+			pruned = False
+			for j in range(first - 1, -1, -1):
+				if score + bounds[j] <= threshold:
+					pruned = True
+					break
+				_, w, ids, tfs = terms[j]
+				c = bisect.bisect_left(ids, doc, cursors[j])
+				cursors[j] = c
+				if c < lengths[j] and ids[c] == doc:
+					tf = tfs[c]
+					hits.append((j, w * tf * k1 / (tf + norm)))
+					score += hits[-1][1]
+			if pruned:
+				continue
+			# Floating-point addition isn't associative: re-add in term order, as search_exhaustive() does
+			score = 0.0
+			for _, contribution in sorted(hits):
+				score += contribution
+			entry = (score, -doc)
+			if len(heap) < k:
+				heapq.heappush(heap, entry)
+			elif entry > heap[0]:
+				heapq.heapreplace(heap, entry)
+			else:
+				continue
+			if len(heap) == k:
+				threshold = heap[0][0]
+				while first < len(terms) and bounds[first] <= threshold:
+					first += 1
+		return [(score, -neg_doc) for score, neg_doc in sorted(heap, reverse=True)]
+
+	def search_exhaustive(self, query, k=10):
+		"""Reference scorer: accumulate every posting of every query term (in the same order as search()), then take the top k."""
+		norms = self.doc_norms
+		k1 = self.k1 + 1
+		scores = {}
+		for _, w, ids, tfs in sorted(self._query_terms(query), key=lambda t: t[0]):
+			for doc, tf in zip(ids, tfs):
+				scores[doc] = scores.get(doc, 0.0) + w * tf * k1 / (tf + norms[doc])
+		return [(score, -neg_doc) for score, neg_doc in heapq.nlargest(k, ((s, -d) for d, s in scores.items()))]
+
+
+def is_fresh(in_file=INPUT_FILE, path=INDEX_FILE):
+	return os.path.exists(path) and os.path.getmtime(path) >= os.path.getmtime(in_file)
+
+
+def open_index(path=INDEX_FILE, in_file=INPUT_FILE):
+	"""Open the index, (re)building it first if it's missing or older than the parsed courses."""
+	if not is_fresh(in_file, path):
+		write_index(*build(iter_documents(in_file)), path)
+	return SearchIndex(path)
+
+
+BENCH_QUERIES = ['algorithms', 'machine learning', 'introduction to the study of',
+	'organic chemistry laboratory', 'public health policy and management', 'data structures', 'ethics']
+
+# Build time, file size, open time and query latency with the catalog repeated `scale` times
+def benchmark(scales=(1, 10, 100), k=10, in_file=INPUT_FILE):
+	documents = list(iter_documents(in_file))
+	print(f"{'scale':>6}{'docs':>10}{'build s':>9}{'size MB':>9}{'open ms':>9}{'maxscore ms':>13}{'exhaustive ms':>15}")
+	with tempfile.TemporaryDirectory() as tmp:
+		for scale in scales:
+			path = os.path.join(tmp, f"index_{scale}.bin")
+			start = time.perf_counter()
+			write_index(*build(doc for _ in range(scale) for doc in documents), path)
+			build_time = time.perf_counter() - start
+			start = time.perf_counter()
+			index = SearchIndex(path)
+			open_time = time.perf_counter() - start
+			fast = slow = 0.0
+			for query in BENCH_QUERIES:
+				start = time.perf_counter()
+				top = index.search(query, k)
+				fast += time.perf_counter() - start
+				start = time.perf_counter()
+				reference = index.search_exhaustive(query, k)
+				slow += time.perf_counter() - start
+				if top != reference:
+					print(f"  warning: top {k} for {query!r} differs from the exhaustive scorer")
+			n = len(BENCH_QUERIES)
+			print(f"{scale:>6}{index.n_docs:>10,}{build_time:>9.1f}{os.path.getsize(path) / 1e6:>9.1f}"
+				f"{open_time * 1000:>9.2f}{fast / n * 1000:>13.1f}{slow / n * 1000:>15.1f}")
+			index.close()
+
+
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser(description='Build or query the in-process BM25 course index.')
+	parser.add_argument('query', nargs='?', help='search text; omit to just rebuild the index')
+	parser.add_argument('-k', type=int, default=10, help='number of results')
+	parser.add_argument('--bench', action='store_true', help='benchmark build time, size and query latency')
+	parser.add_argument('--scales', default='1,10,100', help='catalog replication factors for --bench')
+	args = parser.parse_args()
+	if args.bench:
+		benchmark([int(s) for s in args.scales.split(',')], args.k)
+	elif args.query is None:
+		sections, n_docs, n_terms = build(iter_documents())
+		write_index(sections, n_docs, n_terms)
+		print(f"Indexed {n_docs} courses ({n_terms} terms) into {INDEX_FILE} ({os.path.getsize(INDEX_FILE) / 1e6:.2f} MB)")
+	else:
+		with open_index() as index:
+			for score, doc in index.search(args.query, args.k):
+				number, title = index.document(doc)
+				print(f"{score:7.2f}  {number.replace(chr(0xa0), ' ')}  {title}")
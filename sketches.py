@@ -0,0 +1,148 @@
+# -----------------------------------------------
+#  Fixed-memory frequency sketches
+#
+#  Used by 06_frequency.py --ngrams to find the most common phrases in a
+#  corpus without keeping an exact count for every distinct n-gram:
+#
+#  - CountMinSketch estimates any item's count. It never undercounts and,
+#    with probability 1 - delta, overcounts by at most epsilon * N (N =
+#    total items added). Its size depends only on epsilon and delta.
+#  - SpaceSaving keeps `capacity` candidate items and is guaranteed to
+#    hold every item seen more than N / capacity times. Each count comes
+#    with the most it can be overcounted by.
+#
+#  TopPhrases feeds both and reports each heavy hitter with the tighter
+#  of the two upper bounds and an error estimate, so memory stays the
+#  same whether the corpus has ten thousand n-grams or ten million.
+# -----------------------------------------------
+
+import math
+import zlib
+from array import array
+
+
+class CountMinSketch:
+	"""
+	Count-min sketch with conservative update: adding an item only raises the cells that
+	are below its new estimate, which keeps the same guarantees with less overcounting.
+	"""
+	def __init__(self, epsilon=0.001, delta=0.01):
+		self.epsilon = epsilon
+		self.delta = delta
+		self.width = math.ceil(math.e / epsilon)
+		self.depth = math.ceil(math.log(1 / delta))
+		self.rows = [array('I', bytes(4 * self.width)) for _ in range(self.depth)]
+		self.total = 0
+
+	# Column of item in each row, by double hashing two checksums (stable across runs, unlike hash(), and cheap)
+	def _columns(self, item):
+		data = item.encode('utf-8')
+		h1 = zlib.crc32(data)
+		h2 = zlib.crc32(data, 0x9E3779B9) | 1
+		width = self.width
+		return [(h1 + i * h2) % width for i in range(self.depth)]
+
+	def add(self, item, count=1):
+		"""Add count occurrences of item and return its new estimated count."""
+		cells = list(zip(self.rows, self._columns(item)))
+		estimate = min([row[c] for row, c in cells]) + count
+		for row, c in cells:
+			if row[c] < estimate:
+				row[c] = estimate
+		self.total += count
+		return estimate
+
+	def estimate(self, item):
+		return min(row[c] for row, c in zip(self.rows, self._columns(item)))
+
+	# The additive error that holds with probability 1 - delta
+	def error_bound(self):
+		return self.epsilon * self.total
+
+	def nbytes(self):
+		return sum(row.itemsize * len(row) for row in self.rows)
+
+
+class SpaceSaving:
+	"""
+	Space-Saving heavy hitters with a stream-summary layout: items are grouped in buckets by
+	count, so each update and each eviction is O(1). When a new item arrives and all counters
+	are taken, it replaces the oldest item in the lowest bucket and inherits that count as
+	its error.
+	"""
+	def __init__(self, capacity):
+		self.capacity = capacity
+		self.counts = {}   # item -> count
+		self.errors = {}   # item -> how much of count may come from the item it replaced
+		self.buckets = {}  # count -> items with that count, oldest first (dict as an ordered set)
+		self.min_count = 0
+		self.total = 0
+
+	def _move(self, item, old, new):
+		bucket = self.buckets[old]
+		del bucket[item]
+		if not bucket:
+			del self.buckets[old]
+			if old == self.min_count:
+				self.min_count = new
+		self.buckets.setdefault(new, {})[item] = None
+
+	def add(self, item):
+		self.total += 1
+		count = self.counts.get(item)
+		if count is not None:
+			self.counts[item] = count + 1
+			self._move(item, count, count + 1)
+			return
+		if len(self.counts) < self.capacity:
+			self.counts[item] = 1
+			self.errors[item] = 0
+			self.buckets.setdefault(1, {})[item] = None
+			self.min_count = 1
+			return
+		low = self.min_count
+		bucket = self.buckets[low]
+		victim = next(iter(bucket))
+		del bucket[victim], self.counts[victim], self.errors[victim]
+		if not bucket:
+			del self.buckets[low]
+			self.min_count = low + 1
+		self.counts[item] = low + 1
+		self.errors[item] = low
+		self.buckets.setdefault(low + 1, {})[item] = None
+
+	def top(self, k):
+		"""[(item, count, error)] for the k largest counts; the true count is in [count - error, count]."""
+		ranked = sorted(self.counts.items(), key=lambda kv: (-kv[1], kv[0]))[:k]
+		return [(item, count, self.errors[item]) for item, count in ranked]
+
+
+class TopPhrases:
+	"""
+	Top-k frequent items from a count-min sketch and a Space-Saving summary fed side by side.
+	capacity defaults to 1 / epsilon, so both structures give the same worst-case error.
+	"""
+	def __init__(self, epsilon=0.001, delta=0.01, capacity=None):
+		self.sketch = CountMinSketch(epsilon, delta)
+		self.heavy = SpaceSaving(capacity or math.ceil(1 / epsilon))
+
+	def add(self, item):
+		self.sketch.add(item)
+		self.heavy.add(item)
+
+	@property
+	def total(self):
+		return self.sketch.total
+
+	def top(self, k):
+		"""
+		[(item, count, error)] best first. count is the smaller of the two upper bounds and
+		error is how far above the true count it can be (count - error is a guaranteed lower bound).
+		"""
+		results = []
+		for item, count, error in self.heavy.top(self.heavy.capacity):
+			lower = count - error
+			upper = min(count, self.sketch.estimate(item))
+			results.append((item, upper, upper - lower))
+		results.sort(key=lambda r: (-r[1], r[0]))
+		return results[:k]
@@ -0,0 +1,157 @@
+import importlib
+import os
+import random
+import sys
+import time
+import types
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from PIL import Image, ImageDraw
+
+# 10_extract_1996.py imports pdf2image and pytesseract at the top; the layout pass only needs PIL, and the OCR tests
+# below replace rendering and OCR anyway, so empty stand-ins are enough when they aren't installed
+for name, attrs in (("pdf2image", ("convert_from_path", "pdfinfo_from_path")), ("pytesseract", ("image_to_string",))):
+    if name not in sys.modules:
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            stub = types.ModuleType(name)
+            for attr in attrs:
+                setattr(stub, attr, None)
+            sys.modules[name] = stub
+
+extract = importlib.import_module("10_extract_1996")
+
+
+@pytest.fixture(scope="module")
+def sample():
+    return extract.two_column_pages(pages=3)
+
+
+def add_noise(image, density, seed):
+    # Scan-like specks of 1-4 px all over the page, and a thin rule under the heading
+    noisy = image.copy()
+    draw = ImageDraw.Draw(noisy)
+    rng = random.Random(seed)
+    for _ in range(int(image.width * image.height * density / 16)):
+        x, y, size = rng.randrange(image.width), rng.randrange(image.height), rng.randint(1, 4)
+        draw.rectangle((x, y, x + size - 1, y + size - 1), fill="black")
+    draw.rectangle((110, 190, 1540, 191), fill="black")
+    return noisy
+
+
+@pytest.mark.parametrize("density", [0, 0.0005, 0.002])
+def test_layout_regions_of_two_column_pages(sample, density):
+    images, _ = sample
+    for seed, image in enumerate(images):
+        page = add_noise(image, density, seed) if density else image
+        columns = extract.layout_regions(page, "columns")
+        # The heading, then the left and the right column
+        assert len(columns) == 3
+        heading, left, right = columns
+        assert heading[3] < left[1] and heading[3] < right[1]
+        assert left[2] < right[0]
+        # The heading, then one region per course entry
+        assert len(extract.layout_regions(page, "headers")) == 1 + 2 * 9
+
+
+def test_layout_regions_fall_back_without_two_columns():
+    blank = Image.new("RGB", (1700, 2200), "white")
+    assert extract.layout_regions(blank, "columns") is None
+    assert extract.region_sheet(blank, "headers") is None
+    one_column = blank.copy()
+    draw = ImageDraw.Draw(one_column)
+    font = extract.sample_font(28)
+    for line in range(30):
+        draw.text((120, 120 + line * 50), f"6.{line:03d} A course title that runs across the page", fill="black", font=font)
+    assert extract.layout_regions(one_column, "columns") is None
+
+
+def test_region_sheet_stacks_regions(sample):
+    images, _ = sample
+    regions = extract.layout_regions(images[0], "columns")
+    sheet = extract.region_sheet(images[0], "columns")
+    assert sheet.width <= max(r - l for l, _, r, _ in regions) + 2 * extract.REGION_PAD
+    assert sheet.height == sum(b - t + 2 * extract.REGION_PAD + extract.REGION_GAP for _, t, _, b in regions)
+
+
+def page_text(page_num):
+    return f"6.{page_num:03d} Subject on page {page_num}\nPrereq: None\n"
+
+
+# Stands in for tesseract: the "rendered image" is a text file holding the page's text. Later pages are quicker, so
+# with a pool they finish before the earlier ones.
+def fake_ocr_page(path, mode="page"):
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+    time.sleep(0.02 / int(os.path.basename(path)[5:9]))
+    return text
+
+
+@pytest.fixture
+def fake_part(tmp_path, monkeypatch):
+    pdf = tmp_path / "part.pdf"
+    pdf.write_bytes(b"%PDF-1.4 eleven pages")
+    rendered = []
+
+    def convert_from_path(pdf_path, dpi, first_page, last_page, output_folder, paths_only):
+        rendered.append((first_page, last_page))
+        paths = []
+        for page_num in range(first_page, last_page + 1):
+            path = os.path.join(output_folder, f"page-{page_num:04d}.txt")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(page_text(page_num))
+            paths.append(path)
+        return paths
+
+    monkeypatch.setattr(extract, "pdfinfo_from_path", lambda pdf_path: {"Pages": 11})
+    monkeypatch.setattr(extract, "convert_from_path", convert_from_path)
+    monkeypatch.setattr(extract, "ocr_page", fake_ocr_page)
+    return str(pdf), rendered
+
+
+def expected_courses(page_nums):
+    return [[{"number": f"6.{n:03d}", "title": f"Subject on page {n}"}] for n in page_nums]
+
+
+def test_ocr_part_keeps_page_order_with_a_pool(fake_part, tmp_path):
+    pdf, _ = fake_part
+    out_dir = tmp_path / "pages"
+    out_dir.mkdir()
+    sequential = extract.ocr_part(pdf, 2, str(out_dir), cache_dir=None)
+    # ocr_part only submits and collects, so a thread pool stands in for the process pool (and sees the fakes)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        pooled = extract.ocr_part(pdf, 2, str(out_dir), executor, workers=4, cache_dir=None)
+    assert sequential == pooled == expected_courses(range(1, 12))
+
+
+def test_ocr_part_renders_in_windows(fake_part, tmp_path):
+    pdf, rendered = fake_part
+    out_dir = tmp_path / "pages"
+    out_dir.mkdir()
+    # Part 1 skips its first three pages, and the other eight are rendered four at a time
+    courses = extract.ocr_part(pdf, 1, str(out_dir), window=4, cache_dir=None)
+    assert rendered == [(4, 7), (8, 11)]
+    assert courses == expected_courses(range(4, 12))
+    # Every rendered page is deleted once it's OCRed
+    assert list(out_dir.iterdir()) == []
+
+
+def test_ocr_part_resumes_from_partial_cache(fake_part, tmp_path):
+    pdf, rendered = fake_part
+    out_dir = tmp_path / "pages"
+    out_dir.mkdir()
+    cache_dir = str(tmp_path / "ocr_cache")
+    first = extract.ocr_part(pdf, 1, str(out_dir), window=4, cache_dir=cache_dir)
+    # As if the run had been interrupted before pages 5, 6 and 9 were stored
+    page_dir = extract.ocr_cache_dir(pdf, cache_dir)
+    for page_num in (5, 6, 9):
+        os.remove(extract.ocr_cache_path(page_dir, page_num))
+    del rendered[:]
+    assert extract.ocr_part(pdf, 1, str(out_dir), window=4, cache_dir=cache_dir) == first
+    assert rendered == [(5, 6), (9, 9)]
+    # Everything cached now: nothing is rendered or OCRed
+    del rendered[:]
+    assert extract.ocr_part(pdf, 1, str(out_dir), window=4, cache_dir=cache_dir) == first
+    assert rendered == []
@@ -0,0 +1,59 @@
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import mit_catalog
+
+COURSES = [
+    {"number": "6.001", "title": "Structure and Interpretation of Computer Programs"},
+    {"number": "HST.011", "title": "Human Functional Anatomy"},
+    {"number": "21A.100J", "title": "Introduction to Anthropology"},
+    {"number": "6.002", "title": "Circuits and Electronics"},
+    {"title": "No Number"},
+]
+
+
+def write_json(path, courses):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(courses, f)
+
+
+def test_snapshot_round_trip(tmp_path):
+    path = tmp_path / "courses.json"
+    write_json(path, COURSES)
+    snapshots = tmp_path / "snapshots"
+    first = mit_catalog.load(str(path), str(snapshots))
+    assert os.path.exists(mit_catalog.snapshot_path(str(path), str(snapshots)))
+    second = mit_catalog.load(str(path), str(snapshots))
+    assert vars(first) == vars(second) == vars(mit_catalog.from_json(path.read_bytes()))
+    assert second.depts == ["6", "HST", "21A", "6", None]
+    assert second.records()[:4] == COURSES[:4]
+
+
+def test_snapshot_invalidated_when_json_changes(tmp_path):
+    path = tmp_path / "courses.json"
+    snapshots = str(tmp_path / "snapshots")
+    write_json(path, COURSES)
+    mit_catalog.load(str(path), snapshots)
+    # Same size and mtime as before, different content: only the hash tells them apart once the stat check misses
+    changed = [dict(c, title=c["title"].upper()) for c in COURSES]
+    stat = os.stat(path)
+    write_json(path, changed)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    assert mit_catalog.load(str(path), snapshots).titles == [c["title"] for c in changed]
+    # Touching the file without changing it keeps the snapshot's content
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2))
+    assert mit_catalog.load(str(path), snapshots).titles == [c["title"] for c in changed]
+
+
+def test_concurrent_loads_build_one_valid_snapshot(tmp_path):
+    path = tmp_path / "courses.json"
+    write_json(path, COURSES * 2000)
+    expected = vars(mit_catalog.from_json(path.read_bytes()))
+    for round_ in range(3):
+        snapshots = str(tmp_path / f"snapshots{round_}")
+        with ProcessPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(mit_catalog.load, [str(path)] * 8, [snapshots] * 8))
+        assert all(vars(r) == expected for r in results)
+        assert os.listdir(snapshots) == ["courses.json.snap"]
+        assert vars(mit_catalog.load(str(path), snapshots)) == expected
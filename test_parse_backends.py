@@ -0,0 +1,75 @@
+import importlib
+
+import pytest
+
+# 03_parse.py starts with a digit, so it has to be imported by name
+parse = importlib.import_module("03_parse")
+
+REFERENCE_TSV = "parsed_courses.tsv"  # committed output of the default bs4 backend
+
+
+@pytest.mark.parametrize("backend", ["lxml", "selectolax", "stream"])
+def test_backend_matches_reference_tsv(backend, tmp_path):
+    if backend != "stream":
+        pytest.importorskip(backend)
+    out_file = tmp_path / "parsed_courses.tsv"
+    parse.save_courses(parse.parse_html_files(backend), out_file)
+    with open(REFERENCE_TSV, "r", encoding="utf-8") as f:
+        expected = f.read()
+    assert out_file.read_text(encoding="utf-8") == expected
+
+
+def test_backends_agree_on_single_page():
+    fpath = parse.list_html_files()[0]
+    expected = parse.parse_file(fpath, "bs4")
+    assert expected
+    for backend in ("lxml", "selectolax", "stream"):
+        try:
+            assert parse.parse_file(fpath, backend) == expected
+        except ImportError:
+            continue
+
+
+def test_streaming_handles_concatenated_documents(tmp_path):
+    files = parse.list_html_files()[:3]
+    combined = tmp_path / "combined.html"
+    with open(combined, "w", encoding="utf-8") as out:
+        for fpath in files:
+            with open(fpath, "r", encoding="utf-8") as f:
+                out.write(f.read() + "\n")
+    expected = [c for fpath in files for c in parse.parse_file(fpath)]
+    assert list(parse.iter_courses_streaming(combined, chunk_size=1000)) == expected
+
+
+def test_parse_cache_is_per_backend(tmp_path, monkeypatch):
+    calls = []
+    parse_file_records = parse.parse_file_records
+
+    def counting(fpath, backend="bs4"):
+        calls.append(backend)
+        return parse_file_records(fpath, backend)
+
+    files = parse.list_html_files()[:2]
+    monkeypatch.setattr(parse, "list_html_files", lambda: files)
+    monkeypatch.setattr(parse, "parse_file_records", counting)
+    cache_dir = tmp_path / "cache"
+    bs4_courses = parse.parse_html_files_cached("bs4", cache_dir=cache_dir)
+    assert calls == ["bs4", "bs4"]
+    assert parse.parse_html_files_cached("stream", cache_dir=cache_dir) == bs4_courses
+    assert calls == ["bs4", "bs4", "stream", "stream"]
+    parse.parse_html_files_cached("stream", cache_dir=cache_dir)
+    assert len(calls) == 4
+
+
+def test_parse_cache_stamp_covers_extraction_code(monkeypatch):
+    stamp = parse.parser_stamp("stream")
+    assert parse.parser_stamp("stream") == stamp != parse.parser_stamp("bs4")
+    # An edited backend (here: one of its functions swapped for another) gets a new stamp without a version bump
+    monkeypatch.setitem(parse.EXTRACTION_CODE, "stream", parse.EXTRACTION_CODE["stream"][:-1] + (parse.parse_file_records,))
+    parse.extraction_digest.cache_clear()
+    try:
+        assert parse.parser_stamp("stream") != stamp
+    finally:
+        monkeypatch.undo()
+        parse.extraction_digest.cache_clear()
+    assert parse.parser_stamp("stream") == stamp
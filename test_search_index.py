@@ -0,0 +1,27 @@
+import random
+
+import pytest
+
+import search_index
+
+
+@pytest.fixture(scope="module")
+def index(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("index") / "catalog_index.bin")
+    search_index.write_index(*search_index.build(search_index.iter_documents()), path)
+    with search_index.SearchIndex(path) as idx:
+        yield idx
+
+
+def test_maxscore_matches_exhaustive_exactly(index):
+    rng = random.Random(0)
+    terms = [bytes(index.term_blob[index.term_offsets[t]:index.term_offsets[t + 1]]).decode("utf-8")
+             for t in range(index.n_terms)]
+    common = sorted(range(index.n_terms), key=lambda t: index.post_offsets[t] - index.post_offsets[t + 1])[:300]
+    queries = ["are s course", "introduction to the study of", "machine learning"]
+    for _ in range(500):
+        queries.append(" ".join(terms[rng.choice(common)] if rng.random() < 0.7 else rng.choice(terms)
+                                for _ in range(rng.randint(1, 5))))
+    for query in queries:
+        for k in (1, 10, 50):
+            assert index.search(query, k) == index.search_exhaustive(query, k), (query, k)
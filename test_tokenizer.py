@@ -0,0 +1,60 @@
+import json
+from collections import Counter
+
+import pytest
+
+import tokenizer
+
+SAMPLE = "Intro to C++: Data Structures & Algorithms (Part 2), 4 Credits; Students' Lab"
+
+
+def load_titles(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return [item.get("title", "") for item in json.load(f)]
+
+
+def load_descriptions(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return [line.rstrip("\n").split("\t")[3] for line in f][1:]
+
+
+def test_catalog_profile_sample():
+    assert tokenizer.tokenize(SAMPLE, "catalog") == [
+        "intro", "c", "data", "structures", "algorithms", "part", "credits", "students", "lab",
+    ]
+    assert tokenizer.tokenize("Café Économie—Théorie", "catalog") == ["café", "économie—théorie"]
+
+
+def test_mit_titles_profile_sample():
+    assert tokenizer.tokenize(SAMPLE, "mit_titles") == [
+        "data", "structures", "algorithms", "part", "credits", "students'", "lab",
+    ]
+    assert tokenizer.tokenize("Café Économie—Théorie", "mit_titles") == ["caf", "conomie", "th", "orie"]
+
+
+def test_catalog_profile_reproduces_word_frequencies():
+    with open("course_titles.txt", "r", encoding="utf-8") as f:
+        titles = f.readlines()
+    with open("word_frequencies.json", "r", encoding="utf-8") as f:
+        expected = json.load(f)
+    counts = Counter(tokenizer.tokenize_batch(titles, "catalog"))
+    assert list(counts.items()) == list(expected.items())
+
+
+@pytest.mark.parametrize("path, total, top", [
+    ("10_mit_1996.json", 11244, [("engineering", 238), ("special", 194), ("new", 144), ("systems", 125), ("science", 125)]),
+    ("11_mit_2026.json", 20942, [("special", 576), ("engineering", 561), ("subject", 468), ("science", 419), ("design", 309)]),
+])
+def test_mit_titles_profile_top_terms(path, total, top):
+    tokens = tokenizer.tokenize_batch(load_titles(path), "mit_titles")
+    assert len(tokens) == total
+    assert Counter(tokens).most_common(5) == top
+
+
+@pytest.mark.parametrize("profile, texts", [
+    ("catalog", load_descriptions("cleaned_courses.tsv")),
+    ("mit_titles", load_titles("10_mit_1996.json") + load_titles("11_mit_2026.json")),
+])
+def test_batch_matches_per_text(profile, texts):
+    expected = [word for text in texts for word in tokenizer.tokenize(text, profile)]
+    assert tokenizer.tokenize_batch(texts, profile) == expected